@@ -0,0 +1,64 @@
+import random
+import re as regex
+import sys
+import time
+
+from gedcom_formatter.dates import parseDate
+from benchmarks.synthetic import SyntheticGedcom
+
+MONTH_SWITCHER = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3,
+    'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9,
+    'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+
+GEDCOM_DATE_REGEX = '^(0?[1-9]|[1-2][0-9]|3[0-1]) ([A-Z]{3}) ([1-9]{1}[0-9]{2,3})$'
+
+def regexDate(value):
+    match = regex.match(GEDCOM_DATE_REGEX, value)
+    if match is None:
+        return None
+
+    day, month, year = match.groups()
+
+    return (int(year), MONTH_SWITCHER.get(month, 0), int(day))
+
+def sampleDates(count, distinct, seed = 1):
+    rand = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        year = rand.randint(1600, 1950)
+        kind = rand.random()
+        if kind < 0.6:
+            pool.append('%d %s %d' % (rand.randint(1, 28), rand.choice(SyntheticGedcom.MONTHS), year))
+        elif kind < 0.8:
+            pool.append('ABT %d' % year)
+        elif kind < 0.9:
+            pool.append('%s %d' % (rand.choice(SyntheticGedcom.MONTHS), year))
+        else:
+            pool.append('BET %d AND %d' % (year, year + 5))
+
+    return [rand.choice(pool) for _ in range(count)]
+
+def measure(name, function, values):
+    start = time.perf_counter()
+    parsed = sum(1 for value in values if function(value) is not None)
+    elapsed = time.perf_counter() - start
+
+    print('%-12s %8.3f s %12.0f dates/s %8d parsed' % (name, elapsed, len(values) / elapsed, parsed))
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 1000000
+    distinct = int(argv[2]) if len(argv) > 2 else 2000
+
+    values = sampleDates(count, distinct)
+
+    measure('regex', regexDate, values)
+    measure('uncached', parseDate.__wrapped__, values)
+    parseDate.cache_clear()
+    measure('cached', parseDate, values)
+    print(parseDate.cache_info())
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.dedupe import DuplicateFinder
+from benchmarks.synthetic import SyntheticGedcom
+
+def main(argv):
+    jobs = int(argv[1]) if len(argv) > 1 else 1
+    sizes = [int(size) for size in argv[2:]] or [10000, 30000, 100000]
+
+    print('%11s %8s %8s %11s %10s %8s %9s %8s %13s' % (
+        'individuals', 'blocks', 'largest', 'comparisons', 'candidates', 'recall', 'precision', 'seconds', 'us/individual'
+    ))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            synthetic = SyntheticGedcom(size, duplicateRate = 0.02).generate()
+            filename = synthetic.write(os.path.join(tmp, 'bench.ged'))
+            injected = {tuple(sorted(pair)) for pair in synthetic.getDuplicates()}
+
+            gedcom = Gedcom()
+            gedcom.parseFile(filename)
+
+            finder = DuplicateFinder(gedcom, jobs)
+            start = time.perf_counter()
+            candidates = finder.run()
+            elapsed = time.perf_counter() - start
+
+            found = {(candidate[1], candidate[2]) for candidate in candidates}
+            ranked = {(candidate[1], candidate[2]) for candidate in candidates[:len(injected)]}
+            individuals = len(gedcom.getIndividuals())
+
+            print('%11d %8d %8d %11d %10d %8.3f %9.3f %8.3f %13.1f' % (
+                individuals, finder.getBlockCount(), finder.getLargestBlock(), finder.getComparisonCount(), len(candidates),
+                len(found & injected) / max(len(injected), 1), len(ranked & injected) / max(len(ranked), 1),
+                elapsed, elapsed / individuals * 1e6
+            ))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,50 @@
+import filecmp
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from gedcom_formatter.output.graphviz import Graphviz
+from benchmarks.synthetic import SyntheticGedcom
+
+def measure(tree, stream, filename):
+    start = time.perf_counter()
+    Graphviz(tree, stream).render(filename)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    Graphviz(tree, stream).render(filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 100000
+    depth = int(argv[2]) if len(argv) > 2 else 30
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = SyntheticGedcom(individuals).generate()
+        filename = synthetic.write(os.path.join(tmp, 'bench.ged'))
+
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+        tree = FamilyTree(gedcom)
+        tree.build(synthetic.getRootFamilyId(), depth)
+        print(tree)
+
+        digraphFile = os.path.join(tmp, 'digraph.gv')
+        streamFile = os.path.join(tmp, 'stream.gv')
+
+        print('%-8s %10s %12s %10s' % ('backend', 'seconds', 'peak MiB', 'size MiB'))
+        for name, stream, output in (('digraph', False, digraphFile), ('stream', True, streamFile)):
+            elapsed, peak = measure(tree, stream, output)
+            print('%-8s %10.3f %12.1f %10.1f' % (name, elapsed, peak / 2**20, os.path.getsize(output) / 2**20))
+
+        print('identical output: %s' % filecmp.cmp(digraphFile, streamFile, shallow = False))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from gedcom_formatter.output.json import JsonWriter
+from gedcom_formatter.output.msgpack import MsgpackWriter
+from gedcom_formatter.output.records import TreeRecords
+from benchmarks.synthetic import SyntheticGedcom
+
+def dumpDocument(tree, filename):
+    records = TreeRecords(tree)
+    document = records.getHeader()
+    document['generations'] = list(records.iterGenerations())
+    document['individuals'] = [dict(zip(TreeRecords.INDIVIDUAL_FIELDS, i)) for i in records.iterIndividuals()]
+    document['families'] = [dict(zip(TreeRecords.FAMILY_FIELDS, f)) for f in records.iterFamilies()]
+    document['links'] = list(records.iterLinks())
+
+    with open(filename, 'w', encoding = 'utf-8') as fp:
+        json.dump(document, fp, ensure_ascii = False, separators = (',', ':'))
+
+    return filename
+
+def measure(render, filename):
+    start = time.perf_counter()
+    render(filename)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    render(filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 100000
+    depth = int(argv[2]) if len(argv) > 2 else 30
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = SyntheticGedcom(individuals).generate()
+        filename = synthetic.write(os.path.join(tmp, 'bench.ged'))
+
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+        tree = FamilyTree(gedcom)
+        tree.build(synthetic.getRootFamilyId(), depth)
+        print(tree)
+
+        print('%-10s %10s %12s %10s' % ('writer', 'seconds', 'peak MiB', 'size MiB'))
+        for name, render, output in (
+            ('document', lambda filename: dumpDocument(tree, filename), 'document.json'),
+            ('json', lambda filename: JsonWriter(tree).render(filename), 'stream.json'),
+            ('msgpack', lambda filename: MsgpackWriter(tree).render(filename), 'stream.msgpack')
+        ):
+            output = os.path.join(tmp, output)
+            elapsed, peak = measure(render, output)
+            print('%-10s %10.3f %12.1f %10.1f' % (name, elapsed, peak / 2**20, os.path.getsize(output) / 2**20))
+
+        with open(os.path.join(tmp, 'document.json'), encoding = 'utf-8') as document:
+            with open(os.path.join(tmp, 'stream.json'), encoding = 'utf-8') as stream:
+                print('identical documents: %s' % (json.load(document) == json.load(stream)))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+
+def writeWideGedcom(filename, width, grandchildren = 2):
+    individuals = []
+    families = []
+
+    def individual(gender, parent = None):
+        id = 'I%d' % (len(individuals) + 1)
+        individuals.append([id, gender, parent, []])
+        return individuals[-1]
+
+    def family(husband, wife):
+        id = 'F%d' % (len(families) + 1)
+        families.append([id, husband[0], wife[0], []])
+        husband[3].append(id)
+        wife[3].append(id)
+        return families[-1]
+
+    root = family(individual('M'), individual('F'))
+    for position in range(width):
+        child = individual('M' if position % 2 == 0 else 'F', root[0])
+        root[3].append(child[0])
+
+        spouse = individual('F' if child[1] == 'M' else 'M')
+        childFamily = family(child, spouse) if child[1] == 'M' else family(spouse, child)
+        for _ in range(grandchildren):
+            childFamily[3].append(individual('M', childFamily[0])[0])
+
+    with open(filename, 'w', encoding = 'utf-8') as fp:
+        fp.write('0 HEAD\n')
+        for id, gender, parent, familyIds in individuals:
+            fp.write('0 @%s@ INDI\n1 NAME %s /Wide/\n2 GIVN %s\n2 SURN Wide\n1 SEX %s\n' % (id, id, id, gender))
+            for familyId in familyIds:
+                fp.write('1 FAMS @%s@\n' % familyId)
+        for id, husband, wife, childIds in families:
+            fp.write('0 @%s@ FAM\n1 HUSB @%s@\n1 WIFE @%s@\n' % (id, husband, wife))
+            for childId in childIds:
+                fp.write('1 CHIL @%s@\n' % childId)
+        fp.write('0 TRLR\n')
+
+    return filename
+
+def main(argv):
+    widths = [int(width) for width in argv[1:]] or [100, 1000, 10000, 50000]
+
+    print('%8s %10s %10s %12s' % ('width', 'nodes', 'seconds', 'us/node'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for width in widths:
+            filename = writeWideGedcom(os.path.join(tmp, 'wide%d.ged' % width), width)
+            gedcom = Gedcom()
+            gedcom.parseFile(filename)
+
+            start = time.perf_counter()
+            tree = FamilyTree(gedcom)
+            tree.build('F1', 3)
+            elapsed = time.perf_counter() - start
+
+            nodes = len(tree.getIndividuals())
+            print('%8d %10d %10.3f %12.2f' % (width, nodes, elapsed, elapsed / nodes * 1e6))
+
+if __name__ == '__main__':
+    main(sys.argv)
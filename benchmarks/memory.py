@@ -0,0 +1,53 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from benchmarks.synthetic import SyntheticGedcom
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 1000000
+    depth = int(argv[2]) if len(argv) > 2 else 12
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = SyntheticGedcom(individuals).generate()
+        filename = synthetic.write(os.path.join(tmp, 'bench.ged'))
+        rootFamily = synthetic.getRootFamilyId()
+        del synthetic
+        gc.collect()
+
+        tracemalloc.start()
+
+        start = time.perf_counter()
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+        parseTime = time.perf_counter() - start
+        parsed, parsePeak = tracemalloc.get_traced_memory()
+
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        tree = FamilyTree(gedcom)
+        tree.build(rootFamily, depth)
+        buildTime = time.perf_counter() - start
+        built, buildPeak = tracemalloc.get_traced_memory()
+
+        tracemalloc.stop()
+
+    count = len(gedcom.getIndividuals())
+    nodes = len(tree.getIndividuals())
+
+    print('individuals:  %d' % count)
+    print('parse:        %.2f s, %.1f MiB retained, %.1f MiB peak, %d bytes/individual' % (
+        parseTime, parsed / 2 ** 20, parsePeak / 2 ** 20, parsed / count
+    ))
+    print('tree nodes:   %d' % nodes)
+    print('build:        %.2f s, %.1f MiB retained, %.1f MiB peak, %d bytes/node' % (
+        buildTime, (built - parsed) / 2 ** 20, buildPeak / 2 ** 20, (built - parsed) / max(nodes, 1)
+    ))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from benchmarks.synthetic import SyntheticGedcom
+
+def parse(filename, jobs):
+    start = time.perf_counter()
+    gedcom = Gedcom()
+    gedcom.parseFile(filename, jobs)
+
+    return gedcom, time.perf_counter() - start
+
+def fingerprint(gedcom):
+    return (
+        [str(individual) for individual in gedcom.getIndividuals().values()],
+        [str(family) for family in gedcom.getFamilies()]
+    )
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 100000
+    maxJobs = int(argv[2]) if len(argv) > 2 else os.cpu_count() or 1
+
+    jobCounts = [1]
+    while jobCounts[-1] * 2 <= maxJobs:
+        jobCounts.append(jobCounts[-1] * 2)
+    if jobCounts[-1] != maxJobs:
+        jobCounts.append(maxJobs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = SyntheticGedcom(individuals).generate().write(os.path.join(tmp, 'bench.ged'))
+
+        serial, serialTime = parse(filename, 1)
+        expected = fingerprint(serial)
+
+        print('%4s %10s %8s %s' % ('jobs', 'seconds', 'speedup', 'identical'))
+        print('%4d %10.3f %8.2f %s' % (1, serialTime, 1.0, True))
+
+        for jobs in jobCounts[1:]:
+            gedcom, elapsed = parse(filename, jobs)
+            print('%4d %10.3f %8.2f %s' % (jobs, elapsed, serialTime / elapsed, fingerprint(gedcom) == expected))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,51 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from benchmarks.synthetic import SyntheticGedcom
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 1000000
+    queries = int(argv[2]) if len(argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = SyntheticGedcom(individuals).generate().write(os.path.join(tmp, 'bench.ged'))
+
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+
+        start = time.perf_counter()
+        gedcom.getNameIndex()
+        print('index of %d individuals: %.3f s\n' % (len(gedcom.getIndividuals()), time.perf_counter() - start))
+
+        rnd = random.Random(1)
+        samples = rnd.sample(list(gedcom.getIndividuals().values()), min(queries, len(gedcom.getIndividuals())))
+
+        print('%-24s %10s %10s %10s' % ('query', 'results', 'mean ms', 'max ms'))
+        for label, query in (
+            ('surname prefix', lambda individual: {'surname': individual.getSurname()[:3]}),
+            ('surname + given', lambda individual: {'surname': individual.getSurname(), 'given': individual.getGivenname()}),
+            ('surname + year', lambda individual: {'surname': individual.getSurname(), 'year': individual.getBirthyear()}),
+            ('koelner + year ±2', lambda individual: {
+                'surname': individual.getSurname(), 'year': individual.getBirthyear(), 'tolerance': 2, 'phonetic': 'koelner'
+            }),
+            ('soundex + given', lambda individual: {
+                'surname': individual.getSurname(), 'given': individual.getGivenname(), 'phonetic': 'soundex'
+            })
+        ):
+            results = 0
+            timings = []
+            for individual in samples:
+                start = time.perf_counter()
+                results += len(gedcom.search(limit = 50, **query(individual)))
+                timings.append(time.perf_counter() - start)
+
+            print('%-24s %10.1f %10.3f %10.3f' % (
+                label, results / len(samples), sum(timings) / len(timings) * 1000, max(timings) * 1000
+            ))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from gedcom_formatter.subset import SubsetWriter
+from benchmarks.synthetic import SyntheticGedcom
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 100000
+    depths = [int(depth) for depth in argv[2:]] or [4, 8, 10, 30]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = SyntheticGedcom(individuals).generate()
+        filename = synthetic.write(os.path.join(tmp, 'bench.ged'))
+        output = os.path.join(tmp, 'subset.ged')
+
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+
+        start = time.perf_counter()
+        shutil.copyfile(filename, output)
+        print('copy of %.1f MiB: %.3f s' % (os.path.getsize(filename) / 2**20, time.perf_counter() - start))
+
+        start = time.perf_counter()
+        writer = SubsetWriter(filename)
+        print('index: %.3f s\n' % (time.perf_counter() - start))
+
+        print('%5s %10s %10s %10s %10s' % ('depth', 'records', 'trimmed', 'size MiB', 'seconds'))
+        for depth in depths:
+            tree = FamilyTree(gedcom)
+            tree.build(synthetic.getRootFamilyId(), depth)
+
+            start = time.perf_counter()
+            summary = writer.write(SubsetWriter.collect(tree), output)
+            elapsed = time.perf_counter() - start
+
+            print('%5d %10d %10d %10.1f %10.3f' % (
+                depth, summary['records'], summary['trimmed'], summary['bytes'] / 2**20, elapsed
+            ))
+
+        writer.close()
+
+if __name__ == '__main__':
+    main(sys.argv)
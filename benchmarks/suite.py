@@ -0,0 +1,161 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from gedcom_formatter.output.graphviz import Graphviz
+from benchmarks.synthetic import SyntheticGedcom
+
+PHASES = ('parse', 'build', 'render')
+
+def runPhases(filename, rootFamily, depth, output, memory):
+    results = {}
+    state = {}
+
+    def parse():
+        state['gedcom'] = Gedcom()
+        state['gedcom'].parseFile(filename)
+
+    def build():
+        state['tree'] = FamilyTree(state['gedcom'])
+        state['tree'].build(rootFamily, depth)
+
+    def render():
+        Graphviz(state['tree'], stream = True).render(output)
+
+    for name, phase in zip(PHASES, (parse, build, render)):
+        gc.collect()
+        if memory:
+            tracemalloc.start()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        phase()
+        results[name] = {'wall': time.perf_counter() - wall, 'cpu': time.process_time() - cpu}
+
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name]['peak'] = peak
+
+    results['counts'] = {
+        'individuals': len(state['gedcom'].getIndividuals()),
+        'treeIndividuals': len(state['tree'].getIndividuals()),
+        'treeFamilies': len(state['tree'].getFamilies()),
+        'dotBytes': os.path.getsize(output)
+    }
+
+    return results
+
+def benchmark(size, args, tmp):
+    synthetic = SyntheticGedcom(
+        size, args.children, args.seed, args.collapse_rate, dateFormats = args.date_formats.split(',')
+    ).generate()
+    filename = synthetic.write(os.path.join(tmp, 'suite%d.ged' % size))
+    rootFamily = synthetic.getRootFamilyId()
+    families = synthetic.getFamilyCount()
+    del synthetic
+
+    output = os.path.join(tmp, 'suite%d.gv' % size)
+    timing = runPhases(filename, rootFamily, args.depth, output, False)
+
+    result = {
+        'individuals': size,
+        'families': families,
+        'depth': args.depth,
+        'fileBytes': os.path.getsize(filename),
+        'counts': timing.pop('counts'),
+        'phases': timing
+    }
+
+    if args.memory:
+        memory = runPhases(filename, rootFamily, args.depth, output, True)
+        for name in PHASES:
+            result['phases'][name]['peak'] = memory[name]['peak']
+
+    os.remove(filename)
+    os.remove(output)
+
+    return result
+
+def gitCommit():
+    try:
+        process = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output = True, text = True,
+            cwd = os.path.dirname(os.path.abspath(__file__))
+        )
+    except OSError:
+        return None
+
+    return process.stdout.strip() or None
+
+def printResults(report, baseline = None):
+    previous = {}
+    if baseline is not None:
+        previous = {result['individuals']: result for result in baseline['results']}
+
+    print('%10s %-7s %10s %10s %10s %10s' % ('size', 'phase', 'wall s', 'cpu s', 'peak MiB', 'vs base'))
+    for result in report['results']:
+        for name in PHASES:
+            phase = result['phases'][name]
+            peak = '%10.1f' % (phase['peak'] / 2**20) if 'peak' in phase else '%10s' % '-'
+
+            ratio = '%10s' % '-'
+            base = previous.get(result['individuals'])
+            if base is not None and base['phases'][name]['wall'] > 0:
+                ratio = '%9.2fx' % (phase['wall'] / base['phases'][name]['wall'])
+
+            print('%10d %-7s %10.3f %10.3f %s %s' % (result['individuals'], name, phase['wall'], phase['cpu'], peak, ratio))
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog = 'python3 -m benchmarks.suite')
+    parser.add_argument('sizes', nargs = '*', type = int, default = [1000, 100000, 1000000])
+    parser.add_argument('--depth', type = int, default = 10)
+    parser.add_argument('--children', type = int, default = 3)
+    parser.add_argument('--collapse-rate', type = float, default = 0.0)
+    parser.add_argument('--date-formats', default = 'exact,month,year,about,range')
+    parser.add_argument('--seed', type = int, default = 1)
+    parser.add_argument('--no-memory', dest = 'memory', action = 'store_false')
+    parser.add_argument('--output', default = None, help = 'JSON result file, default benchmark-<commit>.json')
+    parser.add_argument('--compare', default = None, help = 'JSON result file of an earlier run')
+    args = parser.parse_args(argv[1:])
+
+    commit = gitCommit()
+    report = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'depth': args.depth, 'children': args.children, 'collapseRate': args.collapse_rate,
+            'dateFormats': args.date_formats, 'seed': args.seed
+        },
+        'results': []
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            report['results'].append(benchmark(size, args, tmp))
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare, 'r', encoding = 'utf-8') as fp:
+            baseline = json.load(fp)
+
+    printResults(report, baseline)
+
+    output = args.output or 'benchmark-%s.json' % (commit or 'unknown')
+    with open(output, 'w', encoding = 'utf-8') as fp:
+        json.dump(report, fp, indent = 1)
+    print('Results written to %s' % output)
+
+if __name__ == '__main__':
+    main(sys.argv)
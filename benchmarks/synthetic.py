@@ -0,0 +1,267 @@
+import argparse
+import random
+import sys
+from collections import deque
+
+class SyntheticGedcom():
+    SURNAMES = [
+        'Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner',
+        'Becker', 'Schulz', 'Hoffmann', 'Koch', 'Richter', 'Klein', 'Wolf'
+    ]
+
+    MALE_NAMES = ['Hans', 'Karl', 'Otto', 'Friedrich', 'Wilhelm', 'Heinrich', 'Johann', 'Peter']
+
+    FEMALE_NAMES = ['Anna', 'Maria', 'Elisabeth', 'Margarethe', 'Katharina', 'Eva', 'Luise', 'Emma']
+
+    SPELLINGS = {
+        'Müller': 'Mueller', 'Schmidt': 'Schmitt', 'Schneider': 'Schnieder', 'Fischer': 'Fischer',
+        'Weber': 'Webber', 'Meyer': 'Maier', 'Wagner': 'Wagener', 'Becker': 'Bäcker', 'Schulz': 'Schultz',
+        'Hoffmann': 'Hofmann', 'Koch': 'Koch', 'Richter': 'Richter', 'Klein': 'Kleine', 'Wolf': 'Wolff'
+    }
+
+    MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+    DATE_FORMATS = {
+        'exact': '%(day)d %(month)s %(year)d',
+        'month': '%(month)s %(year)d',
+        'year': '%(year)d',
+        'about': 'ABT %(year)d',
+        'before': 'BEF %(day)d %(month)s %(year)d',
+        'after': 'AFT %(year)d',
+        'range': 'BET %(year)d AND %(end)d',
+        'period': 'FROM %(month)s %(year)d TO %(end)d',
+        'calendar': '@#DGREGORIAN@ %(day)d %(month)s %(year)d',
+        'invalid': '%(day)d.%(monthNumber)d.%(year)d'
+    }
+
+    def __init__(
+        self, individuals = 1000, childrenPerFamily = 3, seed = 1, collapseRate = 0.0,
+        families = None, maxDepth = None, dateFormats = ('exact',), duplicateRate = 0.0
+    ):
+        for dateFormat in dateFormats:
+            if dateFormat not in SyntheticGedcom.DATE_FORMATS:
+                raise Exception('Unknown date format: %s' % dateFormat)
+
+        self.__random = random.Random(seed)
+        self.__maxIndividuals = individuals
+        self.__maxFamilies = families
+        self.__maxDepth = maxDepth
+        self.__childrenPerFamily = childrenPerFamily
+        self.__collapseRate = collapseRate
+        self.__dateFormats = list(dateFormats)
+        self.__duplicateRate = duplicateRate
+
+        self.__individuals = []
+        self.__families = []
+        self.__singles = {}
+        self.__duplicates = []
+
+    def generate(self):
+        founders = [self.__addIndividual('M', 1700), self.__addIndividual('F', 1702)]
+        pending = deque([self.__addFamily(founders[0], founders[1])])
+
+        while len(pending) > 0 and len(self.__individuals) < self.__maxIndividuals:
+            family = pending.popleft()
+            birthyear = family['year'] + 1
+
+            if self.__maxDepth is not None and family['generation'] + 1 >= self.__maxDepth:
+                continue
+
+            for _ in range(self.__random.randint(1, self.__childrenPerFamily * 2 - 1)):
+                if len(self.__individuals) >= self.__maxIndividuals:
+                    break
+
+                gender = self.__random.choice('MF')
+                child = self.__addIndividual(gender, birthyear, family)
+                birthyear += self.__random.randint(1, 3)
+
+                if self.__isFamilyLimitReached():
+                    continue
+
+                if self.__random.random() < self.__collapseRate:
+                    spouse = self.__takeSingle(child)
+                    if spouse is None:
+                        self.__singles.setdefault((child['generation'], gender), []).append(child)
+                        continue
+                elif len(self.__individuals) >= self.__maxIndividuals:
+                    break
+                else:
+                    spouse = self.__addIndividual('F' if gender == 'M' else 'M', child['year'])
+                    spouse['generation'] = child['generation']
+
+                if gender == 'M':
+                    pending.append(self.__addFamily(child, spouse))
+                else:
+                    pending.append(self.__addFamily(spouse, child))
+
+        self.__addDuplicates()
+
+        return self
+
+    def __addDuplicates(self):
+        count = int(len(self.__individuals) * self.__duplicateRate)
+        families = {family['id']: family for family in self.__families}
+
+        for original in self.__random.sample(self.__individuals, count):
+            duplicate = dict(original)
+            duplicate['id'] = 'I%d' % (len(self.__individuals) + 1)
+            duplicate['families'] = []
+
+            original.setdefault('birthdate', self.__date(original['year']))
+            original.setdefault('deathdate', self.__date(original['year'] + 70))
+            duplicate['birthdate'] = original['birthdate']
+            duplicate['deathdate'] = original['deathdate']
+
+            variation = self.__random.random()
+            if variation < 0.4:
+                duplicate['surname'] = SyntheticGedcom.SPELLINGS[original['surname']]
+            elif variation < 0.6:
+                duplicate['year'] = original['year'] + self.__random.choice((-1, 1))
+                duplicate['birthdate'] = self.__date(duplicate['year'])
+            elif variation < 0.8:
+                duplicate['birthdate'] = str(original['year'])
+                duplicate['deathdate'] = None
+
+            if duplicate['parent'] is not None:
+                families[duplicate['parent']]['children'].append(duplicate['id'])
+
+            self.__individuals.append(duplicate)
+            self.__duplicates.append((original['id'], duplicate['id']))
+
+    def getDuplicates(self):
+        return self.__duplicates
+
+    def __isFamilyLimitReached(self):
+        return self.__maxFamilies is not None and len(self.__families) >= self.__maxFamilies
+
+    def __takeSingle(self, child):
+        gender = 'F' if child['gender'] == 'M' else 'M'
+        singles = self.__singles.get((child['generation'], gender), [])
+        for position, single in enumerate(singles):
+            if single['parent'] != child['parent']:
+                return singles.pop(position)
+
+        return None
+
+    def getRootFamilyId(self):
+        return self.__families[0]['id']
+
+    def getIndividualCount(self):
+        return len(self.__individuals)
+
+    def getFamilyCount(self):
+        return len(self.__families)
+
+    def getGenerationCount(self):
+        return max(individual['generation'] for individual in self.__individuals) + 1
+
+    def __addIndividual(self, gender, year, parentFamily = None):
+        individual = {
+            'id': 'I%d' % (len(self.__individuals) + 1),
+            'gender': gender,
+            'year': year,
+            'given': self.__random.choice(self.MALE_NAMES if gender == 'M' else self.FEMALE_NAMES),
+            'surname': self.__random.choice(self.SURNAMES),
+            'parent': None,
+            'generation': 0,
+            'families': []
+        }
+
+        if parentFamily is not None:
+            individual['surname'] = parentFamily['surname']
+            individual['parent'] = parentFamily['id']
+            individual['generation'] = parentFamily['generation'] + 1
+            parentFamily['children'].append(individual['id'])
+
+        self.__individuals.append(individual)
+
+        return individual
+
+    def __addFamily(self, husband, wife):
+        family = {
+            'id': 'F%d' % (len(self.__families) + 1),
+            'husband': husband['id'],
+            'wife': wife['id'],
+            'surname': husband['surname'],
+            'generation': husband['generation'],
+            'year': max(husband['year'], wife['year']) + 20 + self.__random.randint(0, 10),
+            'children': []
+        }
+
+        husband['families'].append(family['id'])
+        wife['families'].append(family['id'])
+        self.__families.append(family)
+
+        return family
+
+    def __date(self, year):
+        day = self.__random.randint(1, 28)
+        month = self.__random.choice(self.MONTHS)
+        if len(self.__dateFormats) == 1 and self.__dateFormats[0] == 'exact':
+            return '%d %s %d' % (day, month, year)
+
+        dateFormat = self.__random.choice(self.__dateFormats)
+        return SyntheticGedcom.DATE_FORMATS[dateFormat] % {
+            'day': day, 'month': month, 'monthNumber': self.MONTHS.index(month) + 1,
+            'year': year, 'end': year + self.__random.randint(1, 5)
+        }
+
+    def write(self, filename):
+        with open(filename, 'w', encoding = 'utf-8') as fp:
+            fp.write('0 HEAD\n1 CHAR UTF-8\n')
+
+            for individual in self.__individuals:
+                fp.write('0 @%s@ INDI\n' % individual['id'])
+                fp.write('1 NAME %s /%s/\n' % (individual['given'], individual['surname']))
+                fp.write('2 GIVN %s\n' % individual['given'])
+                fp.write('2 SURN %s\n' % individual['surname'])
+                fp.write('1 SEX %s\n' % individual['gender'])
+                fp.write('1 BIRT\n2 DATE %s\n2 PLAC Köln\n' % (
+                    individual.get('birthdate') or self.__date(individual['year'])
+                ))
+                if 'deathdate' not in individual:
+                    fp.write('1 DEAT\n2 DATE %s\n' % self.__date(individual['year'] + 70))
+                elif individual['deathdate'] is not None:
+                    fp.write('1 DEAT\n2 DATE %s\n' % individual['deathdate'])
+                if individual['parent'] is not None:
+                    fp.write('1 FAMC @%s@\n' % individual['parent'])
+                for familyId in individual['families']:
+                    fp.write('1 FAMS @%s@\n' % familyId)
+
+            for family in self.__families:
+                fp.write('0 @%s@ FAM\n' % family['id'])
+                fp.write('1 HUSB @%s@\n1 WIFE @%s@\n' % (family['husband'], family['wife']))
+                for childId in family['children']:
+                    fp.write('1 CHIL @%s@\n' % childId)
+                fp.write('1 MARR\n2 DATE %s\n' % self.__date(family['year']))
+
+            fp.write('0 TRLR\n')
+
+        return filename
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog = 'python3 -m benchmarks.synthetic')
+    parser.add_argument('filename')
+    parser.add_argument('--individuals', type = int, default = 1000)
+    parser.add_argument('--families', type = int, default = None)
+    parser.add_argument('--children', type = int, default = 3)
+    parser.add_argument('--depth', type = int, default = None)
+    parser.add_argument('--collapse-rate', type = float, default = 0.0)
+    parser.add_argument('--date-formats', default = 'exact', help = ','.join(SyntheticGedcom.DATE_FORMATS))
+    parser.add_argument('--duplicate-rate', type = float, default = 0.0)
+    parser.add_argument('--seed', type = int, default = 1)
+    args = parser.parse_args(argv[1:])
+
+    synthetic = SyntheticGedcom(
+        args.individuals, args.children, args.seed, args.collapse_rate,
+        args.families, args.depth, args.date_formats.split(','), args.duplicate_rate
+    ).generate()
+    synthetic.write(args.filename)
+
+    print('%s: %d individuals, %d families, %d generations, root family %s' % (
+        args.filename, synthetic.getIndividualCount(), synthetic.getFamilyCount(),
+        synthetic.getGenerationCount(), synthetic.getRootFamilyId()
+    ))
+
+if __name__ == '__main__':
+    main(sys.argv)
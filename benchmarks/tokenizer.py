@@ -0,0 +1,52 @@
+import os
+import re as regex
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import GedcomLine
+from gedcom_formatter.tokenizer import GedcomTokenizer
+from benchmarks.synthetic import SyntheticGedcom
+
+def regexLines(filename):
+    count = 0
+    with open(filename, 'rb') as fp:
+        for line in fp:
+            regex.match(GedcomLine.LINE_REGEX, line.decode('utf-8-sig')).groups()
+            count += 1
+
+    return count
+
+def tokenizerLines(filename):
+    count = 0
+    with open(filename, 'rb') as fp:
+        for _ in GedcomTokenizer(fp):
+            count += 1
+
+    return count
+
+def measure(name, function, filename, repeat = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = function(filename)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print('%-10s %10d lines %8.3f s %12.0f lines/s' % (name, count, best, count / best))
+
+    return count / best
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = SyntheticGedcom(individuals).generate().write(os.path.join(tmp, 'bench.ged'))
+
+        regexRate = measure('regex', regexLines, filename)
+        tokenizerRate = measure('tokenizer', tokenizerLines, filename)
+
+    print('speedup: %.2fx' % (tokenizerRate / regexRate))
+
+if __name__ == '__main__':
+    main(sys.argv)
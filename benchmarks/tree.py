@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from benchmarks.synthetic import SyntheticGedcom
+
+def naiveExpansions(gedcom, rootFamily, maxDepth):
+    counts = {}
+
+    def count(familyId, depth):
+        key = (familyId, depth)
+        if key not in counts:
+            total = 1
+            if depth > 1:
+                for childId in gedcom.getFamily(familyId).getChildren():
+                    for childFamilyId in gedcom.getIndividual(childId).getFamilies():
+                        total += count(childFamilyId, depth - 1)
+            counts[key] = total
+
+        return counts[key]
+
+    return count(rootFamily, maxDepth)
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 50000
+    collapseRate = float(argv[2]) if len(argv) > 2 else 0.3
+    maxDepth = int(argv[3]) if len(argv) > 3 else 16
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), maxDepth * 10))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = SyntheticGedcom(individuals, collapseRate = collapseRate).generate()
+        filename = synthetic.write(os.path.join(tmp, 'inbred.ged'))
+
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+
+    rootFamily = synthetic.getRootFamilyId()
+
+    print('%5s %10s %10s %10s %14s %10s' % ('depth', 'seconds', 'families', 'links', 'naive builds', 'nodes'))
+    for depth in range(2, maxDepth + 1, 2):
+        start = time.perf_counter()
+        tree = FamilyTree(gedcom)
+        tree.build(rootFamily, depth)
+        elapsed = time.perf_counter() - start
+
+        print('%5d %10.3f %10d %10d %14d %10d' % (
+            depth, elapsed, len(tree.getFamilies()), len(tree.getLinks()),
+            naiveExpansions(gedcom, rootFamily, depth), len(tree.getIndividuals())
+        ))
+
+if __name__ == '__main__':
+    main(sys.argv)
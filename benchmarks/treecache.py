@@ -0,0 +1,65 @@
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+
+from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.tree import FamilyTree
+from gedcom_formatter.treecache import TreeCache
+from gedcom_formatter.output.graphviz import Graphviz
+from benchmarks.synthetic import SyntheticGedcom
+
+def dot(tree):
+    fp = io.StringIO()
+    Graphviz(tree, True).renderTo(fp)
+
+    return fp.getvalue()
+
+def sweep(gedcom, rootFamily, depths):
+    cache = TreeCache(gedcom)
+    identical = True
+
+    print('%5s %10s %10s %8s %10s' % ('depth', 'cold', 'cached', 'speedup', 'families'))
+    for depth in depths:
+        gc.collect()
+        start = time.perf_counter()
+        cold = FamilyTree(gedcom)
+        cold.build(rootFamily, depth)
+        coldElapsed = time.perf_counter() - start
+
+        gc.collect()
+        start = time.perf_counter()
+        tree = cache.get(rootFamily, depth)
+        cachedElapsed = time.perf_counter() - start
+
+        identical = identical and dot(tree) == dot(cold)
+        print('%5d %10.4f %10.4f %7.1fx %10d' % (
+            depth, coldElapsed, cachedElapsed, coldElapsed / max(cachedElapsed, 1e-9), len(tree.getFamilies())
+        ))
+
+    statistics = cache.getStatistics()
+    print('truncated %d, built %d, fallbacks %d, identical output: %s\n' % (
+        statistics['truncated'], statistics['built'], statistics['fallbacks'], identical
+    ))
+
+def main(argv):
+    individuals = int(argv[1]) if len(argv) > 1 else 100000
+    collapseRate = float(argv[2]) if len(argv) > 2 else 0.0
+    maxDepth = int(argv[3]) if len(argv) > 3 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = SyntheticGedcom(individuals, collapseRate = collapseRate).generate()
+        filename = synthetic.write(os.path.join(tmp, 'bench.ged'))
+
+        gedcom = Gedcom()
+        gedcom.parseFile(filename)
+
+    rootFamily = synthetic.getRootFamilyId()
+
+    print('Deepest first, shallower trees truncated from the cached one')
+    sweep(gedcom, rootFamily, range(maxDepth, 0, -1))
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -1,9 +1,50 @@
+import asyncio
+import time
+
 import click
 from gedcom_formatter.gedcom import Gedcom
+from gedcom_formatter.cache import GedcomCache
 from gedcom_formatter.tree import FamilyTree
-from gedcom_formatter.output.graphviz import Graphviz
+from gedcom_formatter.columns import IndividualColumns
+from gedcom_formatter.dedupe import DuplicateFinder
+from gedcom_formatter.graph import RelationshipGraph
+from gedcom_formatter.batch import BatchRenderer
+from gedcom_formatter.layout import LayoutRunner, ToolNotFoundError
+from gedcom_formatter.media import MediaPreparer
+from gedcom_formatter.output.graphviz import Graphviz, LabelCache
+from gedcom_formatter.output.json import JsonWriter
+from gedcom_formatter.output.msgpack import MsgpackWriter
+from gedcom_formatter.phonetic import ALGORITHMS
+from gedcom_formatter.profiler import PhaseProfiler
+from gedcom_formatter.server import TreeService
+from gedcom_formatter.subset import SubsetWriter
+
+class DefaultGroup(click.Group):
+    def __init__(self, *args, defaultCommand = None, **kwargs):
+        click.Group.__init__(self, *args, **kwargs)
+        self.__defaultCommand = defaultCommand
+
+    def parse_args(self, ctx, args):
+        if len(args) == 0 or (args[0] not in self.commands and args[0] != '--help'):
+            args.insert(0, self.__defaultCommand)
+
+        return click.Group.parse_args(self, ctx, args)
+
+    def format_help(self, ctx, formatter):
+        click.Group.format_help(self, ctx, formatter)
 
-@click.command()
+        command = self.commands[self.__defaultCommand]
+        commandCtx = click.Context(command, info_name = self.__defaultCommand, parent = ctx)
+        rows = [param.get_help_record(commandCtx) for param in command.get_params(commandCtx)]
+
+        with formatter.section('Options of %s (used when no command is given)' % self.__defaultCommand):
+            formatter.write_dl([row for row in rows if row is not None])
+
+@click.group(cls = DefaultGroup, defaultCommand = 'render')
+def cli():
+    pass
+
+@cli.command('render', help = 'Render a tree of FILENAME (the default command).')
 @click.option(
     '--info', 
     'format', 
@@ -17,11 +58,75 @@ from gedcom_formatter.output.graphviz import Graphviz
     flag_value = 'graphviz',
     help = 'Outputs dot-Format for graphviz'
 )
+@click.option(
+    '--json',
+    'format',
+    flag_value = 'json',
+    help = 'Outputs the tree structure as JSON for web viewers'
+)
+@click.option(
+    '--msgpack',
+    'format',
+    flag_value = 'msgpack',
+    help = 'Outputs the tree structure as compact MessagePack with a string table'
+)
+@click.option(
+    '--gedcom',
+    'format',
+    flag_value = 'gedcom',
+    help = 'Outputs a GEDCOM file with only the records of the tree'
+)
+@click.option(
+    '--stats',
+    is_flag = True,
+    default = False,
+    help = 'Add statistics to --info, over the tree or without --root over the whole file (needs numpy)'
+)
+@click.option(
+    '--stream',
+    is_flag = True,
+    default = False,
+    help = 'Write the dot-Format directly to the file instead of building it in memory'
+)
+@click.option(
+    '--layout',
+    required = False,
+    type = click.Choice(LayoutRunner.FORMATS),
+    default = None,
+    help = 'Run dot on the written file and write svg or png next to it'
+)
+@click.option(
+    '--layout-timeout',
+    'layoutTimeout',
+    required = False,
+    type = click.FloatRange(min = 0, min_open = True),
+    default = None,
+    help = 'Seconds after which a layout run is aborted'
+)
+@click.option(
+    '--prepare-media',
+    'prepareMedia',
+    is_flag = True,
+    default = False,
+    help = 'Resize the images of the rendered individuals into the cache directory before rendering'
+)
 @click.option(
     '--root',
     '-r',
-    required = True,
-    help = 'Define the family which is root of tree FXX'
+    required = False,
+    help = 'Define the family which is root of tree FXX (individual IXX with --ancestors)'
+)
+@click.option(
+    '--roots',
+    required = False,
+    help = 'Comma separated list of root ids rendered in one run F1,F2,...'
+)
+@click.option(
+    '--roots-file',
+    'rootsFile',
+    required = False,
+    type = click.Path(exists = True, dir_okay = False),
+    help = 'File with one root id per line rendered in one run'
 )
 @click.option(
     '--depth',
@@ -31,21 +136,489 @@ from gedcom_formatter.output.graphviz import Graphviz
     default = 1,
     help = 'Maximal depth of generations'
 )
+@click.option(
+    '--relationship',
+    nargs = 2,
+    required = False,
+    default = None,
+    help = 'Names the relationship between two individuals IXX IYY'
+)
+@click.option(
+    '--ancestors',
+    is_flag = True,
+    default = False,
+    help = 'Build the pedigree of the root individual instead of descendants'
+)
+@click.option(
+    '--lazy',
+    is_flag = True,
+    default = False,
+    help = 'Index the file and parse only the records the tree needs'
+)
+@click.option(
+    '--no-cache',
+    'noCache',
+    is_flag = True,
+    default = False,
+    help = 'Parse the file without using the parse cache'
+)
+@click.option(
+    '--clear-cache',
+    'clearCache',
+    is_flag = True,
+    default = False,
+    help = 'Remove all cached parse results before running'
+)
+@click.option(
+    '--cache-dir',
+    'cacheDir',
+    required = False,
+    type = click.Path(file_okay = False),
+    help = 'Directory for cached parse results'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    required = False,
+    type = click.IntRange(min = 1),
+    default = 1,
+    help = 'Number of processes used to parse the file and render batches'
+)
+@click.option(
+    '--profile',
+    is_flag = True,
+    default = False,
+    help = 'Report time, memory and counters per phase on stderr'
+)
+@click.option(
+    '--profile-format',
+    'profileFormat',
+    required = False,
+    type = click.Choice(PhaseProfiler.FORMATS),
+    default = 'table',
+    help = 'Format of the --profile report'
+)
+@click.option(
+    '--profile-dump',
+    'profileDump',
+    required = False,
+    type = click.Path(dir_okay = False),
+    help = 'Write cProfile statistics of the parse and build phases to this file'
+)
 @click.argument("filename", type = click.Path(exists = True))
-def cli(**kwargs):
+def render(**kwargs):
     _cli_internal(**kwargs)
 
-def _cli_internal(filename, format, root, depth):
-    gedcom = Gedcom()
-    gedcom.parseFile(filename)
+@cli.command('serve', help = 'Serve trees of FILENAME over HTTP from memory.')
+@click.option('--host', default = '127.0.0.1', help = 'Address to listen on')
+@click.option('--port', '-p', type = int, default = 8080, help = 'Port to listen on')
+@click.option(
+    '--max-trees',
+    'maxTrees',
+    type = click.IntRange(min = 1),
+    default = 32,
+    help = 'Number of built trees kept in memory'
+)
+@click.option(
+    '--max-outputs',
+    'maxOutputs',
+    type = click.IntRange(min = 1),
+    default = 64,
+    help = 'Number of rendered outputs kept in memory'
+)
+@click.option(
+    '--poll-interval',
+    'pollInterval',
+    type = click.FloatRange(min = 0, min_open = True),
+    default = 2.0,
+    help = 'Seconds between checks whether the file changed'
+)
+@click.option(
+    '--layout-timeout',
+    'layoutTimeout',
+    required = False,
+    type = click.FloatRange(min = 0, min_open = True),
+    default = None,
+    help = 'Seconds after which a layout run is aborted'
+)
+@click.option(
+    '--cache-dir',
+    'cacheDir',
+    required = False,
+    type = click.Path(file_okay = False),
+    help = 'Directory for cached parse and layout results'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type = click.IntRange(min = 1),
+    default = 1,
+    help = 'Number of threads building and rendering trees'
+)
+@click.argument("filename", type = click.Path(exists = True))
+def serve(filename, host, port, maxTrees, maxOutputs, pollInterval, layoutTimeout, cacheDir, jobs):
+    service = TreeService(filename, cacheDir, maxTrees, maxOutputs, jobs, layoutTimeout, pollInterval)
+    try:
+        asyncio.run(service.serveForever(host, port))
+    except KeyboardInterrupt:
+        pass
+
+@cli.command('search', help = 'Find individuals of FILENAME by name and birth year with their families.')
+@click.option('--surname', '-s', required = False, help = 'Surname or birth name, or its beginning')
+@click.option('--given', '-g', required = False, help = 'Given names or callname, or their beginning')
+@click.option('--year', '-y', required = False, type = int, help = 'Year of birth')
+@click.option(
+    '--tolerance',
+    type = click.IntRange(min = 0),
+    default = 0,
+    help = 'Years the year of birth may differ'
+)
+@click.option(
+    '--phonetic',
+    required = False,
+    type = click.Choice(ALGORITHMS),
+    default = None,
+    help = 'Match names by sound instead of by beginning'
+)
+@click.option('--limit', '-n', type = click.IntRange(min = 1), default = 50, help = 'Maximal number of results')
+@click.option(
+    '--no-cache',
+    'noCache',
+    is_flag = True,
+    default = False,
+    help = 'Parse the file and build the index without using the parse cache'
+)
+@click.option(
+    '--cache-dir',
+    'cacheDir',
+    required = False,
+    type = click.Path(file_okay = False),
+    help = 'Directory for cached parse results and name indexes'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type = click.IntRange(min = 1),
+    default = 1,
+    help = 'Number of processes used to parse the file'
+)
+@click.argument("filename", type = click.Path(exists = True))
+def search(filename, surname, given, year, tolerance, phonetic, limit, noCache, cacheDir, jobs):
+    if surname is None and given is None and year is None:
+        raise click.UsageError("Missing option '--surname', '--given' or '--year'.")
+
+    if noCache:
+        gedcom = Gedcom()
+        gedcom.parseFile(filename, jobs)
+        gedcom.getNameIndex()
+    else:
+        cache = GedcomCache(cacheDir)
+        gedcom = cache.getOrParse(filename, jobs)
+        cache.getOrBuildNameIndex(filename, gedcom)
+
+    start = time.perf_counter()
+    results = gedcom.search(surname, given, year, tolerance, phonetic, limit)
+    elapsed = time.perf_counter() - start
+
+    for individual, families in results:
+        print(_formatIndividual(gedcom, individual, families))
+    click.echo('%d individuals found in %.1f ms' % (len(results), elapsed * 1000), err = True)
+
+def _formatIndividual(gedcom, individual, families):
+    name = ' '.join(part for part in (individual.getGivenname(), individual.getSurname()) if part)
+    if individual.getBirthname() and individual.getBirthname() != individual.getSurname():
+        name = '%s born %s' % (name, individual.getBirthname())
+
+    years = '%s-%s' % (individual.getBirthyear() or '?', individual.getDeathyear() or '')
+
+    partners = []
+    for family in families:
+        others = [id for id in family.getCouple() if id != individual.getId()]
+        if len(others) > 0 and others[0] in gedcom.getIndividuals():
+            other = gedcom.getIndividual(others[0])
+            partners.append('%s (%s %s)' % (family.getId(), other.getGivenname(), other.getSurname()))
+        else:
+            partners.append(family.getId())
+
+    return '%-8s %-40s %-10s %s' % (individual.getId(), name, years, ', '.join(partners))
+
+@cli.command('dedupe', help = 'Report individuals of FILENAME that are probably duplicates, best candidates first.')
+@click.option(
+    '--min-score',
+    'minScore',
+    type = click.FloatRange(min = 0.0, max = 1.0),
+    default = 0.75,
+    help = 'Minimal similarity of a reported pair'
+)
+@click.option(
+    '--bucket-years',
+    'bucketYears',
+    type = click.IntRange(min = 1),
+    default = DuplicateFinder.BUCKET_YEARS,
+    help = 'Width of the year of birth buckets of the blocking keys'
+)
+@click.option(
+    '--max-years',
+    'maxYears',
+    type = click.IntRange(min = 0),
+    default = DuplicateFinder.MAX_YEARS,
+    help = 'Maximal difference of the years of birth of a pair'
+)
+@click.option(
+    '--window',
+    type = click.IntRange(min = 1),
+    default = DuplicateFinder.WINDOW,
+    help = 'Number of following individuals each one is compared with inside a block'
+)
+@click.option('--limit', '-n', type = click.IntRange(min = 1), default = None, help = 'Maximal number of reported pairs')
+@click.option(
+    '--no-cache',
+    'noCache',
+    is_flag = True,
+    default = False,
+    help = 'Parse the file without using the parse cache'
+)
+@click.option(
+    '--cache-dir',
+    'cacheDir',
+    required = False,
+    type = click.Path(file_okay = False),
+    help = 'Directory for cached parse results'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type = click.IntRange(min = 1),
+    default = 1,
+    help = 'Number of processes used to parse the file and score the blocks'
+)
+@click.argument("filename", type = click.Path(exists = True))
+def dedupe(filename, minScore, bucketYears, maxYears, window, limit, noCache, cacheDir, jobs):
+    if noCache:
+        gedcom = Gedcom()
+        gedcom.parseFile(filename, jobs)
+    else:
+        gedcom = GedcomCache(cacheDir).getOrParse(filename, jobs)
+
+    finder = DuplicateFinder(gedcom, jobs, minScore, bucketYears, window, maxYears)
+
+    start = time.perf_counter()
+    candidates = finder.run()
+    elapsed = time.perf_counter() - start
+
+    print(DuplicateFinder.report(gedcom, candidates, limit))
+    click.echo('%d candidates from %d comparisons in %d blocks (largest %d) in %.3f s' % (
+        len(candidates), finder.getComparisonCount(), finder.getBlockCount(), finder.getLargestBlock(), elapsed
+    ), err = True)
+
+def _cli_internal(
+    filename, format, stats, stream, layout, layoutTimeout, prepareMedia, root, roots, rootsFile, depth, relationship, ancestors,
+    lazy, noCache, clearCache, cacheDir, jobs, profile, profileFormat, profileDump
+):
+    try:
+        batchRoots = BatchRenderer.readRoots(roots, rootsFile)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint = "'--roots' / '--roots-file'") from None
+
+    if not relationship and root is None and len(batchRoots) == 0 and not stats:
+        raise click.UsageError("Missing option '--root' / '-r'.")
+
+    if layout and format != 'graphviz':
+        raise click.UsageError("Option '--layout' requires '--graphviz'.")
+
+    profiler = PhaseProfiler(profileDump)
+    tree = None
+    renderer = None
+    rootFailures = 0
+    layoutFailures = 0
+
+    cache = GedcomCache(cacheDir)
+    layoutRunner = LayoutRunner(cache.getCacheDir(), format = layout or 'svg', timeout = layoutTimeout, jobs = jobs)
+    if clearCache:
+        cache.clear()
+        layoutRunner.clear()
+
+    with profiler.phase('parse'):
+        if lazy:
+            gedcom = Gedcom()
+            gedcom.indexFile(filename)
+        elif noCache:
+            gedcom = Gedcom()
+            gedcom.parseFile(filename, jobs)
+        else:
+            gedcom = cache.getOrParse(filename, jobs)
+
+    if relationship:
+        with profiler.phase('relationship'):
+            _printRelationship(gedcom, *relationship)
+    elif root is None and len(batchRoots) == 0:
+        with profiler.phase('statistics'):
+            _printStatistics(lambda: IndividualColumns.fromGedcom(gedcom))
+    elif len(batchRoots) > 0:
+        if prepareMedia:
+            raise click.UsageError("Option '--prepare-media' renders a single root.")
+
+        with profiler.phase('batch'):
+            start = time.perf_counter()
+            batch = BatchRenderer(gedcom, depth, ancestors, format, jobs, stream, filename)
+            results = batch.run(batchRoots)
+            rootFailures = sum(1 for result in results if result['error'] is not None)
+            print(BatchRenderer.summary(results, time.perf_counter() - start))
+
+        if layout:
+            with profiler.phase('layout'):
+                sources = [result['filename'] for result in results if result['filename'] is not None]
+                layoutFailures += _runLayout(layoutRunner, sources)
+    else:
+        _checkRoot(gedcom, root, ancestors)
+
+        with profiler.phase('build'):
+            tree = FamilyTree(gedcom)
+            if ancestors:
+                tree.buildAncestors(root, depth)
+            else:
+                tree.build(root, depth)
+
+        if format == 'info':
+            print(tree)
+            if stats:
+                with profiler.phase('statistics'):
+                    _printStatistics(lambda: IndividualColumns.fromTree(tree))
+        elif format == 'graphviz':
+            labels = None
+            if prepareMedia:
+                with profiler.phase('media'):
+                    labels = LabelCache(_prepareMedia(tree, cache.getCacheDir(), jobs))
+
+            renderer = Graphviz(tree, stream, labels)
+            with profiler.phase('labels'):
+                renderer.renderLabels()
+
+            with profiler.phase('render'):
+                source = renderer.render()
+
+            missing = renderer.getMissingMedia()
+            if len(missing) > 0:
+                click.echo('Missing %d media files: %s' % (len(missing), ', '.join(missing)), err = True)
+
+            if layout:
+                with profiler.phase('layout'):
+                    layoutFailures += _runLayout(layoutRunner, [source])
+        elif format == 'gedcom':
+            with profiler.phase('render'), SubsetWriter(filename) as writer:
+                summary = writer.write(SubsetWriter.collect(tree))
+
+            click.echo('%s: %d records, %d pointers out of the tree removed' % (
+                summary['filename'], summary['records'], summary['trimmed']
+            ), err = True)
+        else:
+            writer = JsonWriter(tree) if format == 'json' else MsgpackWriter(tree)
+            with profiler.phase('render'):
+                writer.render()
+
+    if profile:
+        _countGedcom(profiler, gedcom, cache)
+        if tree is not None:
+            _countTree(profiler, tree, renderer)
+        click.echo(profiler.report(profileFormat), err = True)
+
+    dumpFile = profiler.dump()
+    if dumpFile is not None:
+        click.echo('cProfile statistics of parse and build written to %s' % dumpFile, err = True)
+
+    failures = []
+    if rootFailures > 0:
+        failures.append('%d roots failed' % rootFailures)
+    if layoutFailures > 0:
+        failures.append('%d layouts failed' % layoutFailures)
+    if len(failures) > 0:
+        raise click.ClickException(', '.join(failures))
+
+def _runLayout(layoutRunner, sources):
+    try:
+        results = layoutRunner.run(sources)
+    except ToolNotFoundError as e:
+        raise click.ClickException(str(e))
+
+    done = [result for result in results if result['error'] is None]
+    failed = [result for result in results if result['error'] is not None]
+    if len(done) > 0:
+        print(LayoutRunner.summary(done))
+    if len(failed) > 0:
+        click.echo(LayoutRunner.summary(failed), err = True)
+
+    return len(failed)
+
+def _countGedcom(profiler, gedcom, cache):
+    profiler.count('cache hits', cache.getHitCount())
+    if cache.getHitCount() == 0 and gedcom.getIndexFilename() is None:
+        profiler.count('lines tokenized', gedcom.getLineCount())
+    for tag, count in sorted(gedcom.getRecordCounts().items()):
+        profiler.count('records %s' % tag, count)
+
+def _countTree(profiler, tree, renderer):
+    profiler.count('individual nodes', len(tree.getIndividuals()))
+    profiler.count('family nodes', len(tree.getFamilies()))
+    profiler.count('families revisited', len(tree.getLinks()))
+
+    if renderer is not None:
+        labels = renderer.getLabels()
+        profiler.count('dot nodes', renderer.getNodeCount())
+        profiler.count('dot edges', renderer.getEdgeCount())
+        profiler.count('labels built', labels.getMissCount())
+        profiler.count('media lookups', labels.getMedia().getLookupCount())
+
+def _printStatistics(columns):
+    try:
+        print(columns().report())
+    except ImportError as e:
+        raise click.ClickException(str(e))
+
+def _prepareMedia(tree, cacheDir, jobs):
+    preparer = MediaPreparer(cacheDir, jobs = jobs)
+    try:
+        summary = preparer.prepare(MediaPreparer.collect(tree))
+    except ToolNotFoundError as e:
+        raise click.ClickException(str(e))
+
+    click.echo('Media: %d resized, %d up to date, %d failed, %d missing' % (
+        len(summary['resized']), len(summary['skipped']), len(summary['failed']), len(summary['missing'])
+    ), err = True)
+    for name in summary['failed']:
+        click.echo('Failed to resize %s' % name, err = True)
+
+    return preparer.getIndex()
+
+def _checkRoot(gedcom, root, ancestors):
+    try:
+        if ancestors:
+            gedcom.getIndividual(root)
+        else:
+            gedcom.getFamily(root)
+    except KeyError:
+        raise click.BadParameter(
+            'Unknown %s: %s' % ('individual' if ancestors else 'family', root), param_hint = "'--root'"
+        ) from None
+
+def _printRelationship(gedcom, sourceId, targetId):
+    for id in (sourceId, targetId):
+        if id not in gedcom.getIndividuals():
+            raise click.BadParameter('Unknown individual: %s' % id, param_hint = "'--relationship'")
+
+    if sourceId == targetId:
+        raise click.BadParameter('Source and target are both %s' % sourceId, param_hint = "'--relationship'")
+
+    graph = RelationshipGraph(gedcom)
+    path = graph.findPath(sourceId, targetId)
+    if path is None:
+        print('%s and %s are not related' % (sourceId, targetId))
+        return
 
-    tree = FamilyTree(gedcom)
-    tree.build(root, depth)
+    print('%s is the %s of %s' % (targetId, graph.describe(path), sourceId))
 
-    if format == 'info':
-        print(tree)
-    elif format == 'graphviz':
-        renderer = Graphviz(tree)
-        renderer.render()
+    steps = [sourceId]
+    for step, id in path:
+        steps.append('-%s-> %s' % (step, id))
+    print(' '.join(steps))
 
 cli(prog_name='python3 -m gedcom_formatter')
\ No newline at end of file
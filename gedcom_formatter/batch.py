@@ -0,0 +1,135 @@
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .gedcom import Gedcom
+from .tree import FamilyTree
+from .output.graphviz import Graphviz, LabelCache
+from .output.json import JsonWriter
+from .output.msgpack import MsgpackWriter
+from .subset import SubsetWriter
+
+_gedcom = None
+_labels = None
+_subset = None
+
+def _initWorker(gedcom, source = None, indexFilename = None):
+    global _gedcom, _labels, _subset
+    if indexFilename is not None:
+        gedcom = Gedcom()
+        gedcom.indexFile(indexFilename)
+
+    _gedcom = gedcom
+    _labels = LabelCache()
+    _subset = SubsetWriter(source) if source is not None else None
+
+def _closeWorker():
+    global _subset
+    if _subset is not None:
+        _subset.close()
+        _subset = None
+
+def _renderRoot(root, depth, ancestors, format, stream = False):
+    result = {'root': root, 'build': 0.0, 'render': 0.0, 'info': '', 'filename': None, 'error': None}
+
+    try:
+        start = time.perf_counter()
+        tree = FamilyTree(_gedcom)
+        if ancestors:
+            tree.buildAncestors(root, depth)
+        else:
+            tree.build(root, depth)
+        result['build'] = time.perf_counter() - start
+        result['info'] = str(tree)
+
+        if format == 'graphviz':
+            start = time.perf_counter()
+            result['filename'] = Graphviz(tree, stream, _labels).render('family_tree_%s.gv' % root)
+            result['render'] = time.perf_counter() - start
+        elif format == 'json':
+            start = time.perf_counter()
+            result['filename'] = JsonWriter(tree).render('family_tree_%s.json' % root)
+            result['render'] = time.perf_counter() - start
+        elif format == 'msgpack':
+            start = time.perf_counter()
+            result['filename'] = MsgpackWriter(tree).render('family_tree_%s.msgpack' % root)
+            result['render'] = time.perf_counter() - start
+        elif format == 'gedcom':
+            start = time.perf_counter()
+            result['filename'] = _subset.write(SubsetWriter.collect(tree), 'family_tree_%s.ged' % root)['filename']
+            result['render'] = time.perf_counter() - start
+    except Exception as e:
+        result['error'] = '%s: %s' % (type(e).__name__, e)
+
+    return result
+
+class BatchRenderer():
+    ROOT_REGEX = re.compile(r'^[A-Za-z0-9_]+$')
+
+    def __init__(self, gedcom, depth, ancestors = False, format = 'graphviz', jobs = 1, stream = False, source = None):
+        self.__gedcom = gedcom
+        self.__depth = depth
+        self.__ancestors = ancestors
+        self.__format = format
+        self.__jobs = jobs
+        self.__stream = stream
+        self.__source = source
+
+    @staticmethod
+    def readRoots(roots = None, rootsFile = None):
+        ids = []
+        if roots:
+            ids.extend(root.strip() for root in roots.split(','))
+
+        if rootsFile:
+            with open(rootsFile, 'r', encoding = 'utf-8') as fp:
+                for line in fp:
+                    line = line.split('#')[0].strip()
+                    if line:
+                        ids.append(line)
+
+        unique = []
+        for id in ids:
+            id = id.replace('@', '')
+            if id and not BatchRenderer.ROOT_REGEX.match(id):
+                raise ValueError('Invalid root id: %s' % id)
+            if id and id not in unique:
+                unique.append(id)
+
+        return unique
+
+    def run(self, roots):
+        arguments = (self.__depth, self.__ancestors, self.__format, self.__stream)
+
+        if self.__jobs <= 1:
+            _initWorker(self.__gedcom, self.__source)
+            try:
+                return [_renderRoot(root, *arguments) for root in roots]
+            finally:
+                _closeWorker()
+
+        # A lazy Gedcom holds a memory map that cannot be pickled, so the workers open their own index
+        indexFilename = self.__gedcom.getIndexFilename()
+        gedcom = self.__gedcom if indexFilename is None else None
+
+        with ProcessPoolExecutor(
+            max_workers = self.__jobs, initializer = _initWorker, initargs = (gedcom, self.__source, indexFilename)
+        ) as executor:
+            futures = [executor.submit(_renderRoot, root, *arguments) for root in roots]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def summary(results, elapsed):
+        lines = ['%-12s %9s %9s  %s' % ('root', 'build s', 'render s', 'result')]
+        for result in results:
+            if result['error'] is not None:
+                outcome = 'failed: %s' % result['error']
+            else:
+                outcome = result['filename'] or result['info']
+
+            lines.append('%-12s %9.3f %9.3f  %s' % (result['root'], result['build'], result['render'], outcome))
+
+        failed = sum(1 for result in results if result['error'] is not None)
+        lines.append('%d roots, %d failed, %.3f s total' % (len(results), failed, elapsed))
+
+        return '\n'.join(lines)
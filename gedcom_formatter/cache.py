@@ -0,0 +1,144 @@
+import gc
+import hashlib
+import os
+import pickle
+
+from .gedcom import Gedcom
+from .search import NameIndex
+
+class GedcomCache():
+    MAGIC = 'gedcom_formatter'
+
+    SUFFIX = '.gedcache'
+
+    NAME_INDEX_SUFFIX = '.nameindex'
+
+    def __init__(self, cacheDir = None):
+        if cacheDir is None:
+            cacheDir = os.path.join(
+                os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'gedcom_formatter'
+            )
+
+        self.__cacheDir = cacheDir
+        self.__hits = 0
+
+    def getCacheDir(self):
+        return self.__cacheDir
+
+    def getHitCount(self):
+        return self.__hits
+
+    def getCacheFile(self, filename, suffix = SUFFIX):
+        key = hashlib.sha1(os.path.realpath(filename).encode('utf-8')).hexdigest()
+        return os.path.join(self.__cacheDir, key + suffix)
+
+    def getOrParse(self, filename, jobs = 1):
+        gedcom = self.load(filename)
+        if gedcom is None:
+            gedcom = Gedcom()
+            gedcom.parseFile(filename, jobs)
+            self.save(filename, gedcom)
+
+        return gedcom
+
+    def getOrBuildNameIndex(self, filename, gedcom):
+        index = self.__load(filename, GedcomCache.NAME_INDEX_SUFFIX, NameIndex.VERSION)
+        if index is None:
+            index = gedcom.getNameIndex()
+            self.__save(filename, GedcomCache.NAME_INDEX_SUFFIX, NameIndex.VERSION, index)
+        else:
+            gedcom.setNameIndex(index)
+
+        return index
+
+    def load(self, filename):
+        gedcom = self.__load(filename, GedcomCache.SUFFIX, Gedcom.VERSION)
+        if gedcom is not None:
+            self.__hits += 1
+
+        return gedcom
+
+    def __load(self, filename, suffix, version):
+        cacheFile = self.getCacheFile(filename, suffix)
+        if not os.path.exists(cacheFile):
+            return None
+
+        try:
+            with open(cacheFile, 'rb') as fp:
+                header = pickle.load(fp)
+                if not self.__isValid(filename, header, version):
+                    return None
+
+                return self.__loadSnapshot(fp)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def __loadSnapshot(self, fp):
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.load(fp)
+        finally:
+            if gcEnabled:
+                gc.enable()
+
+    def save(self, filename, gedcom):
+        self.__save(filename, GedcomCache.SUFFIX, Gedcom.VERSION, gedcom)
+
+    def __save(self, filename, suffix, version, value):
+        os.makedirs(self.__cacheDir, exist_ok = True)
+
+        cacheFile = self.getCacheFile(filename, suffix)
+        tmpFile = '%s.%d.tmp' % (cacheFile, os.getpid())
+        with open(tmpFile, 'wb') as fp:
+            pickle.dump(self.__header(filename, version), fp, protocol = pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, fp, protocol = pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmpFile, cacheFile)
+
+    def clear(self):
+        if not os.path.isdir(self.__cacheDir):
+            return 0
+
+        removed = 0
+        for entry in os.scandir(self.__cacheDir):
+            if entry.name.endswith((GedcomCache.SUFFIX, GedcomCache.NAME_INDEX_SUFFIX)):
+                os.remove(entry.path)
+                removed += 1
+
+        return removed
+
+    def __header(self, filename, version):
+        stat = os.stat(filename)
+
+        return {
+            'magic': GedcomCache.MAGIC,
+            'version': version,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': self.__hashFile(filename)
+        }
+
+    def __isValid(self, filename, header, version):
+        if not isinstance(header, dict) or header.get('magic') != GedcomCache.MAGIC:
+            return False
+
+        if header.get('version') != version:
+            return False
+
+        stat = os.stat(filename)
+        if header.get('size') != stat.st_size:
+            return False
+
+        if header.get('mtime') == stat.st_mtime_ns:
+            return True
+
+        return header.get('hash') == self.__hashFile(filename)
+
+    def __hashFile(self, filename):
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
@@ -0,0 +1,213 @@
+def _importNumpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Statistics require numpy, install it with: pip3 install numpy') from None
+
+    return numpy
+
+class IndividualColumns():
+    UNKNOWN = 0
+    MALE = 1
+    FEMALE = 2
+
+    def __init__(self, individuals, levels = None):
+        np = _importNumpy()
+        self.__np = np
+
+        ids = []
+        columns = ([], [], [], [], [], [], [], [])
+        birthYear, birthMonth, birthDay, deathYear, deathMonth, deathDay, gender, level = columns
+        for individual in individuals:
+            ids.append(individual.getId())
+
+            for date, year, month, day in (
+                (individual.getBirthdate(), birthYear, birthMonth, birthDay),
+                (individual.getDeathdate(), deathYear, deathMonth, deathDay)
+            ):
+                if date is None:
+                    year.append(0)
+                    month.append(0)
+                    day.append(0)
+                else:
+                    year.append(date.getYear())
+                    month.append(date.getMonth())
+                    day.append(date.getDay())
+
+            if individual.isMale():
+                gender.append(IndividualColumns.MALE)
+            elif individual.isFemale():
+                gender.append(IndividualColumns.FEMALE)
+            else:
+                gender.append(IndividualColumns.UNKNOWN)
+
+            level.append(-1 if levels is None else levels.get(individual.getId(), -1))
+
+        self.__ids = ids
+        self.__birthYear = np.array(birthYear, dtype = np.int32)
+        self.__birthMonth = np.array(birthMonth, dtype = np.int8)
+        self.__birthDay = np.array(birthDay, dtype = np.int8)
+        self.__deathYear = np.array(deathYear, dtype = np.int32)
+        self.__deathMonth = np.array(deathMonth, dtype = np.int8)
+        self.__deathDay = np.array(deathDay, dtype = np.int8)
+        self.__gender = np.array(gender, dtype = np.int8)
+        self.__level = np.array(level, dtype = np.int32)
+
+    @staticmethod
+    def fromGedcom(gedcom):
+        return IndividualColumns(gedcom.getIndividuals().values())
+
+    @staticmethod
+    def fromTree(tree):
+        individuals = list(tree.getIndividuals())
+        levels = {individual.getId(): individual.getLevel() for individual in individuals}
+
+        return IndividualColumns([individual.getGedcom() for individual in individuals], levels)
+
+    def getIds(self):
+        return self.__ids
+
+    def getCount(self):
+        return len(self.__ids)
+
+    def getBirthYears(self):
+        return self.__birthYear
+
+    def getBirthMonths(self):
+        return self.__birthMonth
+
+    def getBirthDays(self):
+        return self.__birthDay
+
+    def getDeathYears(self):
+        return self.__deathYear
+
+    def getDeathMonths(self):
+        return self.__deathMonth
+
+    def getDeathDays(self):
+        return self.__deathDay
+
+    def getGenders(self):
+        return self.__gender
+
+    def getLevels(self):
+        return self.__level
+
+    def getGenderCounts(self):
+        counts = self.__np.bincount(self.__gender, minlength = 3)
+
+        return {
+            'male': int(counts[IndividualColumns.MALE]),
+            'female': int(counts[IndividualColumns.FEMALE]),
+            'unknown': int(counts[IndividualColumns.UNKNOWN])
+        }
+
+    def getMissingDates(self):
+        birth = self.__birthYear == 0
+        death = self.__deathYear == 0
+
+        return {
+            'birth': int(birth.sum()),
+            'death': int(death.sum()),
+            'both': int((birth & death).sum()),
+            'birthWithoutDay': int((~birth & (self.__birthDay == 0)).sum()),
+            'deathWithoutDay': int((~death & (self.__deathDay == 0)).sum())
+        }
+
+    def __lifespanMask(self):
+        return (self.__birthYear > 0) & (self.__deathYear >= self.__birthYear)
+
+    def getLifespans(self):
+        mask = self.__lifespanMask()
+        return self.__deathYear[mask] - self.__birthYear[mask]
+
+    def getBirthHistogram(self, bucket = 10):
+        years = self.__birthYear[self.__birthYear > 0]
+        if len(years) == 0:
+            return []
+
+        buckets = years // bucket
+        first = int(buckets.min())
+        counts = self.__np.bincount(buckets - first)
+
+        return [((first + position) * bucket, int(count)) for position, count in enumerate(counts) if count > 0]
+
+    def getGenerations(self):
+        np = self.__np
+        known = self.__level >= 0
+        if not known.any():
+            return []
+
+        levels = self.__level[known]
+        genders = self.__gender[known]
+        size = int(levels.max()) + 1
+
+        counts = np.bincount(levels, minlength = size)
+        males = np.bincount(levels, weights = genders == IndividualColumns.MALE, minlength = size)
+        females = np.bincount(levels, weights = genders == IndividualColumns.FEMALE, minlength = size)
+
+        mask = self.__lifespanMask() & known
+        lifespans = self.__deathYear[mask] - self.__birthYear[mask]
+        lifespanSums = np.bincount(self.__level[mask], weights = lifespans, minlength = size)
+        lifespanCounts = np.bincount(self.__level[mask], minlength = size)
+
+        birthLevels = self.__level[known & (self.__birthYear > 0)]
+        birthYears = self.__birthYear[known & (self.__birthYear > 0)]
+        birthSums = np.bincount(birthLevels, weights = birthYears, minlength = size)
+        birthCounts = np.bincount(birthLevels, minlength = size)
+
+        generations = []
+        for level in np.flatnonzero(counts):
+            generations.append({
+                'level': int(level),
+                'count': int(counts[level]),
+                'male': int(males[level]),
+                'female': int(females[level]),
+                'meanBirthYear': float(birthSums[level] / birthCounts[level]) if birthCounts[level] > 0 else None,
+                'meanLifespan': float(lifespanSums[level] / lifespanCounts[level]) if lifespanCounts[level] > 0 else None
+            })
+
+        return generations
+
+    def report(self, bucket = 10):
+        np = self.__np
+        lines = ['Individuals: %d' % self.getCount()]
+
+        genders = self.getGenderCounts()
+        ratio = '%.3f' % (genders['male'] / genders['female']) if genders['female'] > 0 else '-'
+        lines.append('Gender: %d male, %d female, %d unknown, male/female ratio %s' % (
+            genders['male'], genders['female'], genders['unknown'], ratio
+        ))
+
+        missing = self.getMissingDates()
+        lines.append('Missing dates: %d birth, %d death, %d both, %d birth and %d death without day' % (
+            missing['birth'], missing['death'], missing['both'], missing['birthWithoutDay'], missing['deathWithoutDay']
+        ))
+
+        lifespans = self.getLifespans()
+        if len(lifespans) > 0:
+            lines.append('Lifespan: mean %.1f, median %.1f, min %d, max %d years (%d individuals)' % (
+                lifespans.mean(), np.median(lifespans), lifespans.min(), lifespans.max(), len(lifespans)
+            ))
+
+        generations = self.getGenerations()
+        if len(generations) > 0:
+            lines.append('')
+            lines.append('%10s %8s %8s %8s %12s %12s' % ('generation', 'count', 'male', 'female', 'mean birth', 'mean life'))
+            for generation in generations:
+                lines.append('%10d %8d %8d %8d %12s %12s' % (
+                    generation['level'], generation['count'], generation['male'], generation['female'],
+                    '-' if generation['meanBirthYear'] is None else '%.0f' % generation['meanBirthYear'],
+                    '-' if generation['meanLifespan'] is None else '%.1f' % generation['meanLifespan']
+                ))
+
+        histogram = self.getBirthHistogram(bucket)
+        if len(histogram) > 0:
+            lines.append('')
+            lines.append('Births per %d years:' % bucket)
+            largest = max(count for _, count in histogram)
+            for start, count in histogram:
+                lines.append('%6d %8d %s' % (start, count, '#' * max(1, count * 40 // largest)))
+
+        return '\n'.join(lines)
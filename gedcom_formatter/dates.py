@@ -0,0 +1,143 @@
+from functools import lru_cache
+
+class GedcomDate():
+    __slots__ = ('__qualifier', '__year', '__month', '__day', '__end')
+
+    MONTHS = {
+        'JAN': 1, 'FEB': 2, 'MAR': 3,
+        'APR': 4, 'MAY': 5, 'JUN': 6,
+        'JUL': 7, 'AUG': 8, 'SEP': 9,
+        'OCT': 10, 'NOV': 11, 'DEC': 12
+    }
+
+    QUALIFIERS = ('ABT', 'CAL', 'EST', 'BEF', 'AFT')
+
+    RANGES = {'BET': 'AND', 'FROM': 'TO'}
+
+    QUALIFIER_FORMATS = {
+        'ABT': 'ca. %s', 'CAL': 'ca. %s', 'EST': 'ca. %s',
+        'BEF': 'vor %s', 'AFT': 'nach %s',
+        'FROM': 'ab %s', 'TO': 'bis %s'
+    }
+
+    def __init__(self, qualifier, year, month = 0, day = 0, end = None):
+        self.__qualifier = qualifier
+        self.__year = year
+        self.__month = month
+        self.__day = day
+        self.__end = end
+
+    def getQualifier(self):
+        return self.__qualifier
+
+    def getYear(self):
+        return self.__year
+
+    def getMonth(self):
+        return self.__month
+
+    def getDay(self):
+        return self.__day
+
+    def getEnd(self):
+        return self.__end
+
+    def isExact(self):
+        return self.__qualifier == '' and self.__day > 0
+
+    def isRange(self):
+        return self.__end is not None
+
+    def getTuple(self):
+        return (self.__year, self.__month, self.__day)
+
+    def __getitem__(self, index):
+        return self.getTuple()[index]
+
+    def __iter__(self):
+        return iter(self.getTuple())
+
+    def __len__(self):
+        return 3
+
+    def format(self):
+        if self.__day > 0:
+            formatted = '%02d.%02d.%d' % (self.__day, self.__month, self.__year)
+        elif self.__month > 0:
+            formatted = '%02d.%d' % (self.__month, self.__year)
+        else:
+            formatted = '%d' % self.__year
+
+        if self.__end is not None:
+            return '%s-%s' % (formatted, self.__end.format())
+
+        if self.__qualifier in GedcomDate.QUALIFIER_FORMATS:
+            return GedcomDate.QUALIFIER_FORMATS[self.__qualifier] % formatted
+
+        return formatted
+
+    def __repr__(self):
+        return 'GedcomDate(%r, %d, %d, %d, %r)' % (
+            self.__qualifier, self.__year, self.__month, self.__day, self.__end
+        )
+
+@lru_cache(maxsize = 4096)
+def parseDate(value):
+    parts = value.upper().split()
+    if len(parts) == 0:
+        return None
+
+    keyword = parts[0]
+
+    if keyword in GedcomDate.QUALIFIERS:
+        return _parseSimpleDate(keyword, parts[1:])
+
+    if keyword in GedcomDate.RANGES:
+        separator = GedcomDate.RANGES[keyword]
+        if separator not in parts:
+            return _parseSimpleDate(keyword, parts[1:])
+
+        position = parts.index(separator)
+        end = _parseSimpleDate('', parts[position + 1:])
+        if end is None:
+            return None
+
+        return _parseSimpleDate(keyword, parts[1:position], end)
+
+    if keyword == 'TO':
+        return _parseSimpleDate(keyword, parts[1:])
+
+    if keyword == 'INT':
+        phrase = [part.startswith('(') for part in parts]
+        if True in phrase:
+            parts = parts[:phrase.index(True)]
+        return _parseSimpleDate(keyword, parts[1:])
+
+    return _parseSimpleDate('', parts)
+
+def _parseSimpleDate(qualifier, parts, end = None):
+    if len(parts) > 0 and parts[0].startswith('@#'):
+        while len(parts) > 0 and not parts[0].endswith('@'):
+            parts = parts[1:]
+        parts = parts[1:]
+
+    if len(parts) == 0 or len(parts) > 3:
+        return None
+
+    year = parts[-1].split('/')[0]
+    if not year.isdigit() or not year.isascii():
+        return None
+
+    month = 0
+    if len(parts) > 1:
+        month = GedcomDate.MONTHS.get(parts[-2], 0)
+        if month == 0:
+            return None
+
+    day = 0
+    if len(parts) > 2:
+        if not parts[0].isdigit() or not parts[0].isascii() or not 1 <= int(parts[0]) <= 31:
+            return None
+        day = int(parts[0])
+
+    return GedcomDate(qualifier, int(year), month, day, end)
@@ -0,0 +1,371 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .phonetic import koelner, normalize, tokenize
+
+class Profile():
+    __slots__ = (
+        '__id', '__gender', '__surnames', '__surnameCodes', '__givennames', '__givennameCodes', '__birth', '__death',
+        '__places', '__parentFamilies', '__relatives', '__blockKeys', '__sortKey'
+    )
+
+    def __init__(
+        self, id, gender, surnames, givennames, birth, death, places, parentFamilies, relatives, blockKeys, sortKey
+    ):
+        self.__id = id
+        self.__gender = gender
+        self.__surnames = frozenset(surnames)
+        self.__surnameCodes = frozenset(koelner(surname) for surname in surnames)
+        self.__givennames = frozenset(givennames)
+        self.__givennameCodes = frozenset(koelner(givenname) for givenname in givennames)
+        self.__birth = birth
+        self.__death = death
+        self.__places = frozenset(places)
+        self.__parentFamilies = frozenset(parentFamilies)
+        self.__relatives = frozenset(relatives)
+        self.__blockKeys = blockKeys
+        self.__sortKey = sortKey
+
+    def getId(self):
+        return self.__id
+
+    def getGender(self):
+        return self.__gender
+
+    def getSurnames(self):
+        return self.__surnames
+
+    def getSurnameCodes(self):
+        return self.__surnameCodes
+
+    def getGivennames(self):
+        return self.__givennames
+
+    def getGivennameCodes(self):
+        return self.__givennameCodes
+
+    def getBirth(self):
+        return self.__birth
+
+    def getDeath(self):
+        return self.__death
+
+    def getPlaces(self):
+        return self.__places
+
+    def getParentFamilies(self):
+        return self.__parentFamilies
+
+    def getRelatives(self):
+        return self.__relatives
+
+    def getBlockKeys(self):
+        return self.__blockKeys
+
+    def getSortKey(self):
+        return self.__sortKey
+
+WEIGHTS = {'surname': 0.15, 'given': 0.2, 'birth': 0.3, 'death': 0.15, 'place': 0.05, 'family': 0.15}
+
+def _similarity(first, second, firstCodes, secondCodes):
+    if len(first) == 0 or len(second) == 0:
+        return None
+
+    exact = len(first & second) / len(first | second)
+    sound = len(firstCodes & secondCodes) / len(firstCodes | secondCodes)
+
+    return (exact + sound) / 2
+
+def _dateSimilarity(first, second, maxYears):
+    if first is None or second is None:
+        return None
+
+    years = abs(first[0] - second[0])
+    if years > maxYears:
+        return 0.0
+    if years > 0:
+        return 0.3 / years
+    if 0 in (first[1], second[1]):
+        return 0.8
+    if first[1] != second[1]:
+        return 0.3
+    if 0 in (first[2], second[2]):
+        return 0.8
+    if first[2] != second[2]:
+        return 0.5
+
+    return 1.0
+
+def _setSimilarity(first, second):
+    if len(first) == 0 or len(second) == 0:
+        return None
+
+    return len(first & second) / len(first | second)
+
+def _weighted(components):
+    total = 0.0
+    weights = 0.0
+    for name, similarity in components.items():
+        if similarity is not None:
+            total += WEIGHTS[name] * similarity
+            weights += WEIGHTS[name]
+
+    return total, weights
+
+def _score(first, second, maxYears, minScore):
+    if first.getGender() and second.getGender() and first.getGender() != second.getGender():
+        return None
+
+    if not (first.getGivennameCodes() & second.getGivennameCodes()) or \
+        not (first.getSurnameCodes() & second.getSurnameCodes()):
+        return None
+
+    birth = _dateSimilarity(first.getBirth(), second.getBirth(), maxYears)
+    if birth == 0.0:
+        return None
+
+    components = {
+        'surname': _similarity(
+            first.getSurnames(), second.getSurnames(), first.getSurnameCodes(), second.getSurnameCodes()
+        ),
+        'given': _similarity(
+            first.getGivennames(), second.getGivennames(), first.getGivennameCodes(), second.getGivennameCodes()
+        ),
+        'birth': birth
+    }
+
+    total, weights = _weighted(components)
+    remaining = 1.0 - WEIGHTS['surname'] - WEIGHTS['given'] - WEIGHTS['birth']
+    if weights > 0 and max(total / weights, (total + remaining) / (weights + remaining)) < minScore:
+        return None
+
+    components['death'] = _dateSimilarity(first.getDeath(), second.getDeath(), maxYears)
+    components['place'] = _setSimilarity(first.getPlaces(), second.getPlaces())
+    if first.getParentFamilies() & second.getParentFamilies():
+        components['family'] = 1.0
+    else:
+        components['family'] = _setSimilarity(first.getRelatives(), second.getRelatives())
+
+    total, weights = _weighted(components)
+
+    return total / weights, components
+
+def _owner(first, second, complete):
+    for key in first.getBlockKeys():
+        if key in complete and key in second.getBlockKeys():
+            return key
+
+    return None
+
+def _scoreBlocks(blocks, complete, window, maxYears, minScore):
+    candidates = []
+    comparisons = 0
+    for key, profiles in blocks:
+        profiles.sort(key = Profile.getSortKey)
+
+        for position, first in enumerate(profiles):
+            for second in profiles[position + 1:position + 1 + window]:
+                owner = _owner(first, second, complete)
+                if owner is not None and owner != key:
+                    continue
+
+                comparisons += 1
+                result = _score(first, second, maxYears, minScore)
+                if result is None or result[0] < minScore:
+                    continue
+
+                if first.getId() < second.getId():
+                    candidates.append((result[0], first.getId(), second.getId(), result[1]))
+                else:
+                    candidates.append((result[0], second.getId(), first.getId(), result[1]))
+
+    return candidates, comparisons
+
+class DuplicateFinder():
+    BUCKET_YEARS = 10
+
+    WINDOW = 20
+
+    MAX_YEARS = 5
+
+    BLOCKS_PER_JOB = 8
+
+    def __init__(
+        self, gedcom, jobs = 1, minScore = 0.75, bucketYears = BUCKET_YEARS, window = WINDOW, maxYears = MAX_YEARS
+    ):
+        self.__gedcom = gedcom
+        self.__jobs = jobs
+        self.__minScore = minScore
+        self.__bucketYears = bucketYears
+        self.__window = window
+        self.__maxYears = maxYears
+        self.__blockCount = 0
+        self.__largestBlock = 0
+        self.__comparisonCount = 0
+        self.__families = None
+        self.__coupleNames = {}
+
+    def getBlockCount(self):
+        return self.__blockCount
+
+    def getLargestBlock(self):
+        return self.__largestBlock
+
+    def getComparisonCount(self):
+        return self.__comparisonCount
+
+    def profile(self, individual):
+        surnames = set(tokenize('%s %s' % (individual.getSurname(), individual.getBirthname())))
+        givens = set(tokenize('%s %s' % (individual.getGivenname(), individual.getCallname())))
+        birth = DuplicateFinder.__date(individual.getBirthdate())
+
+        places = set()
+        for prefix, place in (('b', individual.getBirthplace()), ('d', individual.getDeathplace())):
+            place = normalize(place)
+            if place:
+                places.add(prefix + place)
+
+        parents = set(individual.getParentFamilies())
+        parentNames = set()
+        for familyId in parents:
+            parentNames.update(name for _, name in self.__names(familyId))
+
+        relatives = set(parentNames)
+        for familyId in individual.getFamilies():
+            relatives.update(name for id, name in self.__names(familyId) if id != individual.getId())
+
+        return Profile(
+            individual.getId(),
+            'M' if individual.isMale() else 'F' if individual.isFemale() else '',
+            surnames,
+            givens,
+            birth,
+            DuplicateFinder.__date(individual.getDeathdate()),
+            places,
+            parents,
+            relatives,
+            self.blockKeys(individual),
+            (' '.join(tokenize(individual.getGivenname())), birth[0] if birth else 0, tuple(sorted(parentNames)))
+        )
+
+    def blockKeys(self, individual):
+        birth = DuplicateFinder.__date(individual.getBirthdate())
+        names = {individual.getSurname(), individual.getBirthname()}
+        codes = {koelner(''.join(tokenize(name))) for name in names}
+        codes.discard('')
+
+        givens = tokenize(individual.getGivenname()) or tokenize(individual.getCallname())
+        initial = givens[0][0] if givens else ''
+
+        if birth is None:
+            buckets = {''}
+        else:
+            half = self.__bucketYears // 2
+            buckets = {'a%d' % (birth[0] // self.__bucketYears), 'b%d' % ((birth[0] + half) // self.__bucketYears)}
+
+        return tuple(sorted('%s|%s|%s' % (code, bucket, initial) for code in codes for bucket in buckets))
+
+    def blocks(self):
+        blocks = {}
+        for individual in self.__gedcom.getIndividuals().values():
+            profile = self.profile(individual)
+            for key in profile.getBlockKeys():
+                blocks.setdefault(key, []).append(profile)
+
+        return [(key, profiles) for key, profiles in blocks.items() if len(profiles) > 1]
+
+    def run(self):
+        blocks = self.blocks()
+        self.__blockCount = len(blocks)
+        self.__largestBlock = max((len(profiles) for _, profiles in blocks), default = 0)
+
+        complete = frozenset(key for key, profiles in blocks if len(profiles) <= self.__window + 1)
+        arguments = (complete, self.__window, self.__maxYears, self.__minScore)
+
+        if self.__jobs <= 1:
+            scored, self.__comparisonCount = _scoreBlocks(blocks, *arguments)
+        else:
+            scored = []
+            self.__comparisonCount = 0
+            with ProcessPoolExecutor(max_workers = self.__jobs) as executor:
+                futures = [
+                    executor.submit(_scoreBlocks, chunk, *arguments)
+                    for chunk in DuplicateFinder.__split(blocks, self.__jobs * DuplicateFinder.BLOCKS_PER_JOB)
+                ]
+                for future in futures:
+                    candidates, comparisons = future.result()
+                    scored.extend(candidates)
+                    self.__comparisonCount += comparisons
+
+        unique = {}
+        for candidate in scored:
+            unique[(candidate[1], candidate[2])] = candidate
+
+        candidates = list(unique.values())
+        candidates.sort(key = lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+
+        return candidates
+
+    @staticmethod
+    def __split(blocks, count):
+        chunks = [[] for _ in range(count)]
+        loads = [0] * count
+        for block in sorted(blocks, key = lambda block: len(block[1]), reverse = True):
+            position = loads.index(min(loads))
+            chunks[position].append(block)
+            loads[position] += len(block[1])
+
+        return [chunk for chunk in chunks if len(chunk) > 0]
+
+    def __names(self, familyId):
+        if familyId in self.__coupleNames:
+            return self.__coupleNames[familyId]
+
+        if self.__families is None:
+            self.__families = {family.getId(): family for family in self.__gedcom.getFamilies()}
+
+        names = []
+        if familyId in self.__families:
+            individuals = self.__gedcom.getIndividuals()
+            for id in self.__families[familyId].getCouple():
+                if id not in individuals:
+                    continue
+
+                givens = tokenize(individuals[id].getGivenname())
+                names.append((id, '%s:%s' % (koelner(givens[0]) if givens else '', koelner(individuals[id].getBirthname()))))
+
+        self.__coupleNames[familyId] = names
+
+        return names
+
+    @staticmethod
+    def __date(date):
+        if date is None or date.getYear() == 0:
+            return None
+
+        return date.getTuple()
+
+    @staticmethod
+    def report(gedcom, candidates, limit = None):
+        lines = ['%5s  %-8s %-32s %-10s %-8s %-32s %-10s  %s' % (
+            'score', 'id', 'name', 'years', 'id', 'name', 'years', 'components'
+        )]
+
+        for score, firstId, secondId, components in candidates[:limit]:
+            first = gedcom.getIndividual(firstId)
+            second = gedcom.getIndividual(secondId)
+            lines.append('%5.3f  %-8s %-32s %-10s %-8s %-32s %-10s  %s' % (
+                score,
+                firstId, DuplicateFinder.__name(first), DuplicateFinder.__years(first),
+                secondId, DuplicateFinder.__name(second), DuplicateFinder.__years(second),
+                ' '.join('%s %.2f' % (name, similarity) for name, similarity in components.items() if similarity is not None)
+            ))
+
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __name(individual):
+        return ' '.join(part for part in (individual.getGivenname(), individual.getSurname()) if part)
+
+    @staticmethod
+    def __years(individual):
+        return '%s-%s' % (individual.getBirthyear() or '?', individual.getDeathyear() or '')
@@ -1,13 +1,37 @@
-import re as regex
+import mmap
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .tokenizer import GedcomTokenizer, GedcomParseError
+from .index import GedcomIndex
+from .dates import parseDate
+from .search import NameIndex
+
+class Event():
+    __slots__ = ('__date', '__location')
+
+    def __init__(self, date, location):
+        self.__date = date
+        self.__location = location
+
+    def getDate(self):
+        return self.__date
+
+    def getLocation(self):
+        return self.__location
+
+    def __repr__(self):
+        return 'Event(%s, %r)' % (self.__date, self.__location)
 
 class GedcomElement:
+    __slots__ = ('_id', '_values')
+
     def __init__(self, id, event_tags):
         self._id = self._parseId(id)
         self._values = {}
 
         for prefix in event_tags.values():
-            self._values['%s_is' % prefix] = False
+            setattr(self, '_%s' % prefix, None)
 
     def getId(self):
         return self._id
@@ -16,39 +40,20 @@ class GedcomElement:
         return rawId.replace('@', '').strip()
 
     def _parseEvent(self, prefix, child):
-        self._values['%s_is' % prefix] = True
-        date = self.__parseDate(child)
-        if date is not None:
-            self._values['%s_date' % prefix] = date
+        setattr(self, '_%s' % prefix, Event(self.__parseDate(child), self.__parseLocation(child)))
 
-        self._values['%s_location' % prefix] = self.__parseLocation(child)
-        
+    def _getEvent(self, prefix):
+        return getattr(self, '_%s' % prefix)
+
+    def _removeEvent(self, prefix):
+        setattr(self, '_%s' % prefix, None)
 
     def __parseDate(self, event):
-        MONTH_SWITCHER = {
-            'JAN': 1, 'FEB': 2, 'MAR': 3,
-            'APR': 4, 'MAY': 5, 'JUN': 6,
-            'JUL': 7, 'AUG': 8, 'SEP': 9,
-            'OCT': 10, 'NOV': 11, 'DEC': 12
-        }
-
-        GEDCOM_DATE_REGEX = '^(0?[1-9]|[1-2][0-9]|3[0-1]) ([A-Z]{3}) ([1-9]{1}[0-9]{2,3})$'
-        
         date = event.getChildByTag('DATE')
         if date is None:
             return None
 
-        match = regex.match(GEDCOM_DATE_REGEX, date.getValue())
-
-        if match is None:
-            return None
-
-        day, month, year = match.groups()
-
-        month_parsed = MONTH_SWITCHER.get(month, 0)
-
-        return (int(year), month_parsed, int(day))
-
+        return parseDate(date.getValue())
 
     def __parseLocation(self, event):
         location = []
@@ -72,32 +77,55 @@ class GedcomElement:
         return ''
 
     def _getDateOrNone(self, prefix):
-        if self._isEvent(prefix, True):
-            return self._values['%s_date' % prefix]
+        event = self._getEvent(prefix)
+        if event is not None:
+            return event.getDate()
 
         return None
 
     def _getDateFormattedOrEmpty(self, prefix):
         date = self._getDateOrNone(prefix)
         if date is not None:
-            return '%02d.%02d.%d' % (date[2], date[1], date[0])
+            return date.format()
+
+        return ''
+
+    def _getLocationOrEmpty(self, prefix):
+        event = self._getEvent(prefix)
+        if event is not None:
+            return event.getLocation()
 
         return ''
 
     def _getYearOrZero(self, prefix):
         date = self._getDateOrNone(prefix)
         if date is not None:
-            return date[0]
+            return date.getYear()
 
         return 0
 
     def _isEvent(self, prefix, checkDateExists = False):
-        if self._values['%s_is' % prefix]:
-            return not checkDateExists or self._keyExists('%s_date' % prefix)
+        event = self._getEvent(prefix)
+        if event is not None:
+            return not checkDateExists or event.getDate() is not None
 
         return False
 
+    def _getEvents(self, event_tags):
+        events = {}
+        for prefix in event_tags.values():
+            event = self._getEvent(prefix)
+            if event is not None:
+                events[prefix] = event
+
+        return events
+
 class GedcomIndividual(GedcomElement):
+    __slots__ = (
+        '_birth', '_baptism', '_death', '_burial', '_confirmation', '__families', '__parentFamilies',
+        '__files'
+    )
+
     TAG = 'INDI'
 
     VALUE_TAGS = {
@@ -121,12 +149,14 @@ class GedcomIndividual(GedcomElement):
         'CONF': 'confirmation'
     }
 
-    SKIP_TAGS = ['_UID', 'FAMC', 'CHAN']
+    SKIP_TAGS = ['_UID', 'CHAN']
 
     def __init__(self, raw):
         GedcomElement.__init__(self, raw.getPointer(), GedcomIndividual.EVENT_TAGS)
 
         self.__families = []
+        self.__parentFamilies = []
+        self.__files = []
 
         for child in raw.getChildren():
             tag = child.getTag()
@@ -144,13 +174,17 @@ class GedcomIndividual(GedcomElement):
                 self._parseEvent(GedcomIndividual.EVENT_TAGS[tag], child)
             elif tag == 'FAMS':
                 self.__families.append(self._parseId(child.getValue()))
+            elif tag == 'FAMC':
+                self.__parentFamilies.append(self._parseId(child.getValue()))
             elif tag == 'OBJE':
-                if 'file' in self._values:
+                file = child.getChildByTag('FILE')
+                if file is None:
                     continue
 
-                file = child.getChildByTag('FILE')
-                filename = file.getValue().replace('C:\\', '').replace('\\', '/')
-                self._values['file'] = os.path.basename(filename)
+                filename = os.path.basename(file.getValue().replace('C:\\', '').replace('\\', '/'))
+                self.__files.append(filename)
+                if 'file' not in self._values:
+                    self._values['file'] = filename
             elif tag in GedcomIndividual.SKIP_TAGS:
                 continue
             else:
@@ -159,6 +193,9 @@ class GedcomIndividual(GedcomElement):
     def getFamilies(self):
         return self.__families
 
+    def getParentFamilies(self):
+        return self.__parentFamilies
+
     def isMale(self):
         return self._getValueOrEmptyString('gender') == 'M'   
 
@@ -212,6 +249,9 @@ class GedcomIndividual(GedcomElement):
     def getBirthdateFormatted(self):
         return self._getDateFormattedOrEmpty('birth')
 
+    def getBirthplace(self):
+        return self._getLocationOrEmpty('birth')
+
     def isDeathdate(self):
         return self._isEvent('death', True)
 
@@ -227,16 +267,24 @@ class GedcomIndividual(GedcomElement):
     def getDeathdateFormatted(self):
         return self._getDateFormattedOrEmpty('death')
 
+    def getDeathplace(self):
+        return self._getLocationOrEmpty('death')
+
     def isFile(self):
         return self._keyExists('file')
 
     def getFile(self):
         return self._getValueOrEmptyString('file')
 
+    def getFiles(self):
+        return self.__files
+
     def __str__(self):
-        return '%s: %s' % (self._id, self._values)
+        return '%s: %s %s' % (self._id, self._values, self._getEvents(GedcomIndividual.EVENT_TAGS))
 
 class GedcomFamily(GedcomElement):
+    __slots__ = ('_marriage', '_divorce', '__couple', '__children')
+
     TAG = 'FAM'
 
     EVENT_TAGS = {
@@ -265,7 +313,7 @@ class GedcomFamily(GedcomElement):
             elif tag in GedcomFamily.EVENT_TAGS:
                 self._parseEvent(GedcomFamily.EVENT_TAGS[tag], child)
             elif tag == '_STAT' and value == 'NOT MARRIED':
-                self._values['marriage_is'] = False
+                self._removeEvent('marriage')
             elif tag in GedcomFamily.SKIP_TAGS:
                 continue
             else:
@@ -295,6 +343,9 @@ class GedcomFamily(GedcomElement):
     def getMarriagedateFormatted(self):
         return self._getDateFormattedOrEmpty('marriage')
 
+    def getMarriageplace(self):
+        return self._getLocationOrEmpty('marriage')
+
     def isDivorcedate(self):
         return self._isEvent('divorce', True)
 
@@ -311,10 +362,14 @@ class GedcomFamily(GedcomElement):
         return self._getDateFormattedOrEmpty('divorce')
 
     def __str__(self):
-        return '%s: %s %s %s' % (self._id, self.__couple, self.__children, self._values)
+        return '%s: %s %s %s' % (
+            self._id, self.__couple, self.__children, self._getEvents(GedcomFamily.EVENT_TAGS)
+        )
 
 class GedcomLine():
-    LINE_REGEX = '^(0|[1-9]+[0-9]*) (@[A-Z0-9]+@ |)([A-Za-z0-9_]+)(.*|)$' 
+    __slots__ = ('__children', '__parent', '__level', '__pointer', '__tag', '__value')
+
+    LINE_REGEX = GedcomTokenizer.LINE_REGEX
 
     def __init__(self, level, pointer, tag, value):
         self.__children = []
@@ -360,65 +415,248 @@ class GedcomLine():
         self.__parent = element  
 
 class Gedcom():
+    VERSION = 7
+
+    CHUNKS_PER_JOB = 4
+
     def __init__(self):
         self.__individuals = {}
         self.__families = {}
+        self.__parentFamilies = {}
+        self.__index = None
+        self.__lineCount = 0
+        self.__recordCounts = {}
+        self.__nameIndex = None
+
+    def parseFile(self, filename, jobs = 1):
+        if jobs > 1:
+            self.__parseParallel(filename, jobs)
+            return
+
+        self.parseRange(filename, 0, os.path.getsize(filename))
+
+    def __parseParallel(self, filename, jobs):
+        chunks = Gedcom.splitRecords(filename, jobs * Gedcom.CHUNKS_PER_JOB)
+
+        with ProcessPoolExecutor(max_workers = jobs) as executor:
+            futures = [executor.submit(_parseChunk, filename, start, end) for start, end in chunks]
+
+            lineOffset = 0
+            for future in futures:
+                try:
+                    gedcom, lineCount = future.result()
+                except GedcomParseError as e:
+                    for pending in futures:
+                        pending.cancel()
+                    raise e.withLineOffset(lineOffset) from None
+
+                self.__individuals.update(gedcom.__individuals)
+                self.__families.update(gedcom.__families)
+                for childId, familyId in gedcom.__parentFamilies.items():
+                    self.__parentFamilies.setdefault(childId, familyId)
+                for tag, count in gedcom.__recordCounts.items():
+                    self.__recordCounts[tag] = self.__recordCounts.get(tag, 0) + count
+                lineOffset += lineCount
+
+            self.__lineCount += lineOffset
+
+    @staticmethod
+    def splitRecords(filename, count):
+        size = os.path.getsize(filename)
+        if size == 0:
+            return []
 
-    def parseFile(self, filename):
         with open(filename, 'rb') as fp:
-            lineNumber = 1
-            rootElement = GedcomLine(-1, '', 'ROOT', '')
-            lastElement = rootElement
-            for line in fp:
-                lastElement = self.__parseLine(lineNumber, line.decode('utf-8-sig'), lastElement)
-                lineNumber += 1
-
-        for element in rootElement.getChildren():
-            if element.getTag() == GedcomIndividual.TAG:
-                individual = GedcomIndividual(element)
-                self.__individuals[individual.getId()] = individual
-            
-        for element in rootElement.getChildren():
-            if element.getTag() == GedcomFamily.TAG:
-                family = GedcomFamily(element)
-                self.__families[family.getId()] = family
-            
-    def __parseLine(self, lineNumber, line, lastElement):
-        matches = regex.match(GedcomLine.LINE_REGEX, line)
-        if matches is None:
-            errorMessage = "Line %d: %s parse error" % (lineNumber, line)
-            raise Exception(errorMessage)
+            with mmap.mmap(fp.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                chunks = []
+                start = 0
+                for part in range(1, count + 1):
+                    if start >= size:
+                        break
 
-        else:
-            level, pointer, tag, value = matches.groups()
-            level = int(level)
+                    end = data.find(b'\n0 ', max(start, size * part // count - 1))
+                    end = size if end == -1 or part == count else end + 1
+                    chunks.append((start, end))
+                    start = end
+
+        return chunks
+
+    def parseRange(self, filename, start, end):
+        with open(filename, 'rb') as fp:
+            fp.seek(start)
+            tokens = GedcomTokenizer(fp, size = end - start)
+            for record in Gedcom.iterTokenRecords(tokens):
+                self.addRecord(record)
+
+        self.__lineCount += tokens.getLineCount()
+
+        return tokens.getLineCount()
+
+    def indexFile(self, filename):
+        self.__index = GedcomIndex(filename)
+
+    def getIndexFilename(self):
+        return self.__index.getFilename() if self.__index is not None else None
+
+    def __loadRecord(self, id, tag):
+        try:
+            for record in Gedcom.iterTokenRecords(self.__index.getTokens(id, tag)):
+                return record
+        except GedcomParseError as e:
+            raise e.withLineOffset(self.__index.getLineOffset(id)) from None
+
+    def __loadAll(self):
+        if self.__index is None:
+            return
+
+        individuals = {}
+        for id in self.__index.getIds(GedcomIndividual.TAG):
+            individuals[id] = self.getIndividual(id)
+
+        families = [self.getFamily(id) for id in self.__index.getIds(GedcomFamily.TAG)]
+
+        self.__individuals = individuals
+        self.__families = {}
+        self.__parentFamilies = {}
+        for family in families:
+            self.__addFamily(family)
+
+        self.__index.close()
+        self.__index = None
+
+    def addRecord(self, record):
+        tag = record.getTag()
+        self.__countRecord(tag)
+        if tag == GedcomIndividual.TAG:
+            individual = GedcomIndividual(record)
+            self.__individuals[individual.getId()] = individual
+        elif tag == GedcomFamily.TAG:
+            family = GedcomFamily(record)
+            self.__addFamily(family)
+
+    def __countRecord(self, tag):
+        self.__recordCounts[tag] = self.__recordCounts.get(tag, 0) + 1
+
+    def getLineCount(self):
+        return self.__lineCount
+
+    def getRecordCounts(self):
+        return self.__recordCounts
+
+    def __addFamily(self, family):
+        self.__families[family.getId()] = family
+        for childId in family.getChildren():
+            self.__parentFamilies.setdefault(childId, family.getId())
+
+    @staticmethod
+    def iterRecords(filename):
+        with open(filename, 'rb') as fp:
+            yield from Gedcom.iterTokenRecords(GedcomTokenizer(fp))
+
+    @staticmethod
+    def iterTokenRecords(tokens):
+        rootElement = GedcomLine(-1, '', 'ROOT', '')
+        lastElement = rootElement
+        record = None
+        for lineNumber, level, pointer, tag, value in tokens:
+            lastElement = Gedcom.__addLine(lineNumber, level, pointer, tag, value, lastElement)
+
+            if level == 0:
+                if record is not None:
+                    yield record
+                record = lastElement
+
+        if record is not None:
+            yield record
 
-            if level > lastElement.getLevel() + 1:
-                errorMessage = "Line %d: %d level violation" % (lineNumber, level)
-                raise Exception(errorMessage)
+    @staticmethod
+    def __addLine(lineNumber, level, pointer, tag, value, lastElement):
+        if level > lastElement.getLevel() + 1:
+            raise GedcomParseError(lineNumber, '%d level violation' % level)
 
-            element = GedcomLine(level, pointer, tag, value)
+        element = GedcomLine(level, pointer, tag, value)
 
-            parent = lastElement
+        parent = lastElement
 
-            while parent.getLevel() > level - 1:
-                parent = parent.getParent()
+        while parent.getLevel() > level - 1:
+            parent = parent.getParent()
 
+        if level > 0:
             parent.addChild(element)
+        else:
+            element.setParent(parent)
 
-            return element
+        return element
 
     def getIndividuals(self):
+        self.__loadAll()
         return self.__individuals
 
     def getIndividual(self, id):
+        if id not in self.__individuals and self.__index is not None:
+            self.__individuals[id] = GedcomIndividual(self.__loadRecord(id, GedcomIndividual.TAG))
+            self.__countRecord(GedcomIndividual.TAG)
+
         return self.__individuals[id]
 
     def getFamilies(self):
+        self.__loadAll()
         return self.__families.values()
 
     def getFamily(self, id):
+        if id not in self.__families and self.__index is not None:
+            self.__addFamily(GedcomFamily(self.__loadRecord(id, GedcomFamily.TAG)))
+            self.__countRecord(GedcomFamily.TAG)
+
         return self.__families[id]
 
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_Gedcom__nameIndex'] = None
+
+        return state
+
+    def hasNameIndex(self):
+        return self.__nameIndex is not None
+
+    def setNameIndex(self, index):
+        self.__nameIndex = index
+
+    def getNameIndex(self):
+        if self.__nameIndex is None:
+            self.__nameIndex = NameIndex(self.getIndividuals().values())
+
+        return self.__nameIndex
+
+    def search(self, surname = None, given = None, year = None, tolerance = 0, phonetic = None, limit = None):
+        results = []
+        for id in self.getNameIndex().search(surname, given, year, tolerance, phonetic, limit):
+            individual = self.getIndividual(id)
+            families = [self.__families[familyId] for familyId in individual.getFamilies() if familyId in self.__families]
+            results.append((individual, families))
+
+        return results
+
+    def getParentFamily(self, id):
+        familyId = self.__parentFamilies.get(id)
+        if familyId is None:
+            parentFamilies = self.getIndividual(id).getParentFamilies()
+            if len(parentFamilies) == 0:
+                return None
+            familyId = parentFamilies[0]
+
+        return self.getFamily(familyId)
+
     def __str__(self):
+        if self.__index is not None:
+            return 'Individuals: %d, Families: %d' % (
+                self.__index.count(GedcomIndividual.TAG), self.__index.count(GedcomFamily.TAG)
+            )
+
         return 'Individuals: %d, Families: %d' % (len(self.__individuals), len(self.__families))
+
+def _parseChunk(filename, start, end):
+    gedcom = Gedcom()
+    lineCount = gedcom.parseRange(filename, start, end)
+
+    return gedcom, lineCount
@@ -0,0 +1,221 @@
+from array import array
+
+class RelationshipGraph():
+    UP = 'U'
+    DOWN = 'D'
+    SPOUSE = 'S'
+
+    ORDINALS = ['zeroth', 'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth']
+
+    REMOVED = ['', ' once removed', ' twice removed', ' thrice removed']
+
+    def __init__(self, gedcom):
+        self.__gedcom = gedcom
+        self.__ids = list(gedcom.getIndividuals().keys())
+        self.__numbers = {id: number for number, id in enumerate(self.__ids)}
+
+        parents = []
+        children = []
+        spouses = []
+        for family in gedcom.getFamilies():
+            couple = [self.__numbers[id] for id in family.getCouple() if id in self.__numbers]
+            childs = [self.__numbers[id] for id in family.getChildren() if id in self.__numbers]
+
+            for child in childs:
+                for parent in couple:
+                    parents.append((child, parent))
+                    children.append((parent, child))
+
+            for partner in couple:
+                for other in couple:
+                    if partner != other:
+                        spouses.append((partner, other))
+
+        self.__parents = self.__compress(parents)
+        self.__children = self.__compress(children)
+        self.__spouses = self.__compress(spouses)
+
+    def __compress(self, edges):
+        count = len(self.__ids)
+
+        offsets = array('l', [0]) * (count + 1)
+        for source, _ in edges:
+            offsets[source + 1] += 1
+        for number in range(count):
+            offsets[number + 1] += offsets[number]
+
+        targets = array('l', [0]) * len(edges)
+        position = array('l', offsets)
+        for source, target in edges:
+            targets[position[source]] = target
+            position[source] += 1
+
+        return offsets, targets
+
+    def __neighbours(self, adjacency, number):
+        offsets, targets = adjacency
+        return targets[offsets[number]:offsets[number + 1]]
+
+    def getNumber(self, id):
+        return self.__numbers[id]
+
+    def getId(self, number):
+        return self.__ids[number]
+
+    def getParents(self, id):
+        return [self.__ids[number] for number in self.__neighbours(self.__parents, self.__numbers[id])]
+
+    def getChildren(self, id):
+        return [self.__ids[number] for number in self.__neighbours(self.__children, self.__numbers[id])]
+
+    def getSpouses(self, id):
+        return [self.__ids[number] for number in self.__neighbours(self.__spouses, self.__numbers[id])]
+
+    def __expand(self, number):
+        for step, adjacency in (
+            (RelationshipGraph.UP, self.__parents),
+            (RelationshipGraph.DOWN, self.__children),
+            (RelationshipGraph.SPOUSE, self.__spouses)
+        ):
+            for neighbour in self.__neighbours(adjacency, number):
+                yield step, neighbour
+
+    def findPath(self, sourceId, targetId):
+        source = self.__numbers[sourceId]
+        target = self.__numbers[targetId]
+        if source == target:
+            return []
+
+        forward = {source: (None, None, 0)}
+        backward = {target: (None, None, 0)}
+        forwardFrontier = [source]
+        backwardFrontier = [target]
+
+        while len(forwardFrontier) > 0 and len(backwardFrontier) > 0:
+            if len(forwardFrontier) <= len(backwardFrontier):
+                forwardFrontier, meeting = self.__advance(forwardFrontier, forward, backward)
+            else:
+                backwardFrontier, meeting = self.__advance(backwardFrontier, backward, forward)
+
+            if meeting is not None:
+                return self.__joinPath(meeting, forward, backward)
+
+        return None
+
+    def __advance(self, frontier, visited, other):
+        nextFrontier = []
+        meeting = None
+        shortest = None
+        for number in frontier:
+            depth = visited[number][2] + 1
+            for step, neighbour in self.__expand(number):
+                if neighbour in visited:
+                    continue
+
+                visited[neighbour] = (number, step, depth)
+                nextFrontier.append(neighbour)
+
+                if neighbour in other and (shortest is None or depth + other[neighbour][2] < shortest):
+                    meeting = neighbour
+                    shortest = depth + other[neighbour][2]
+
+        return nextFrontier, meeting
+
+    def __joinPath(self, meeting, forward, backward):
+        reverse = {RelationshipGraph.UP: RelationshipGraph.DOWN, RelationshipGraph.DOWN: RelationshipGraph.UP}
+
+        path = []
+        number = meeting
+        while forward[number][0] is not None:
+            previous, step, _ = forward[number]
+            path.insert(0, (step, self.__ids[number]))
+            number = previous
+
+        number = meeting
+        while backward[number][0] is not None:
+            following, step, _ = backward[number]
+            path.append((reverse.get(step, step), self.__ids[following]))
+            number = following
+
+        return path
+
+    def describe(self, path):
+        if path is None:
+            return None
+        if len(path) == 0:
+            return 'self'
+
+        segments = []
+        ups = downs = 0
+        previousId = None
+        for step, id in path:
+            if step == RelationshipGraph.SPOUSE:
+                if ups + downs > 0:
+                    segments.append(self.__bloodRelation(ups, downs, previousId))
+                segments.append(self.__gendered(id, 'husband', 'wife', 'spouse'))
+                ups = downs = 0
+            elif step == RelationshipGraph.UP and downs > 0:
+                segments.append(self.__bloodRelation(ups, downs, previousId))
+                ups, downs = 1, 0
+            elif step == RelationshipGraph.UP:
+                ups += 1
+            else:
+                downs += 1
+
+            previousId = id
+
+        if ups + downs > 0:
+            segments.append(self.__bloodRelation(ups, downs, previousId))
+
+        return "'s ".join(segments)
+
+    def __bloodRelation(self, ups, downs, id):
+        if downs == 0:
+            return self.__lineal(ups, id, ('father', 'mother', 'parent'))
+
+        if ups == 0:
+            return self.__lineal(downs, id, ('son', 'daughter', 'child'))
+
+        if ups == 1 and downs == 1:
+            return self.__gendered(id, 'brother', 'sister', 'sibling')
+
+        if ups == 1:
+            return 'great-' * (downs - 3) + ('grand' if downs > 2 else '') + \
+                self.__gendered(id, 'nephew', 'niece', 'nibling')
+
+        if downs == 1:
+            return 'great-' * (ups - 2) + self.__gendered(id, 'uncle', 'aunt', 'pibling')
+
+        degree = min(ups, downs) - 1
+        removed = abs(ups - downs)
+
+        ordinal = '%dth' % degree
+        if degree < len(RelationshipGraph.ORDINALS):
+            ordinal = RelationshipGraph.ORDINALS[degree]
+
+        times = ' %d times removed' % removed
+        if removed < len(RelationshipGraph.REMOVED):
+            times = RelationshipGraph.REMOVED[removed]
+
+        return '%s cousin%s' % (ordinal, times)
+
+    def __lineal(self, generations, id, words):
+        word = self.__gendered(id, *words)
+        if generations == 1:
+            return word
+
+        return 'great-' * (generations - 2) + 'grand' + word
+
+    def __gendered(self, id, male, female, neutral):
+        individual = self.__gedcom.getIndividual(id)
+        if individual.isMale():
+            return male
+        if individual.isFemale():
+            return female
+
+        return neutral
+
+    def __str__(self):
+        return 'Individuals: %d, parent links: %d, spouse links: %d' % (
+            len(self.__ids), len(self.__parents[1]), len(self.__spouses[1])
+        )
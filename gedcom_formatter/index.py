@@ -0,0 +1,106 @@
+import codecs
+import io
+import mmap
+
+from .tokenizer import GedcomTokenizer
+
+class GedcomIndex():
+    def __init__(self, filename):
+        self.__filename = filename
+        self.__records = {}
+        self.__head = None
+        self.__newline = b'\n'
+
+        self.__fp = open(filename, 'rb')
+        if self.__isEmpty():
+            self.__map = b''
+        else:
+            self.__map = mmap.mmap(self.__fp.fileno(), 0, access = mmap.ACCESS_READ)
+
+        self.__scan()
+
+    def __isEmpty(self):
+        self.__fp.seek(0, io.SEEK_END)
+        empty = self.__fp.tell() == 0
+        self.__fp.seek(0)
+
+        return empty
+
+    def __scan(self):
+        data = self.__map
+        size = len(data)
+
+        start = len(codecs.BOM_UTF8) if data[:3] == codecs.BOM_UTF8 else 0
+        while start < size:
+            end = data.find(b'\n0 ', start)
+            end = size if end == -1 else end + 1
+
+            headerEnd = data.find(b'\n', start, end)
+            header = data[start:end if headerEnd == -1 else headerEnd].split()
+            if len(header) >= 3 and header[1].startswith(b'@'):
+                id = header[1].replace(b'@', b'').decode('ascii')
+                self.__records[id] = (header[2].decode('ascii'), start, end)
+            elif len(header) >= 2 and header[1] == b'HEAD':
+                self.__head = (start, end)
+                if headerEnd > start and data[headerEnd - 1:headerEnd] == b'\r':
+                    self.__newline = b'\r\n'
+
+            start = end
+
+    def getFilename(self):
+        return self.__filename
+
+    def getIds(self, tag):
+        return [id for id, record in self.__records.items() if record[0] == tag]
+
+    def count(self, tag):
+        return sum(1 for record in self.__records.values() if record[0] == tag)
+
+    def getRange(self, id):
+        return self.__records[id][1:]
+
+    def getRanges(self, ids):
+        records = self.__records
+        return [records[id][1:] for id in ids]
+
+    def getTag(self, id):
+        return self.__records[id][0]
+
+    def countTags(self, ids):
+        records = self.__records
+        counts = {}
+        for id in ids:
+            tag = records[id][0]
+            counts[tag] = counts.get(tag, 0) + 1
+
+        return counts
+
+    def contains(self, id):
+        return id in self.__records
+
+    def getData(self):
+        return self.__map
+
+    def getHead(self):
+        if self.__head is None:
+            return b''
+
+        return self.__map[self.__head[0]:self.__head[1]]
+
+    def getNewline(self):
+        return self.__newline
+
+    def getTokens(self, id, tag):
+        recordTag, start, end = self.__records[id]
+        if recordTag != tag:
+            raise KeyError(id)
+
+        return GedcomTokenizer(io.BytesIO(self.__map[start:end]))
+
+    def getLineOffset(self, id):
+        return self.__map[:self.__records[id][1]].count(b'\n')
+
+    def close(self):
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.close()
+        self.__fp.close()
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class ToolNotFoundError(Exception):
+    pass
+
+class LayoutRunner():
+    FORMATS = ('svg', 'png')
+
+    def __init__(self, cacheDir, engine = 'dot', format = 'svg', timeout = None, jobs = 1, flags = None):
+        if format not in LayoutRunner.FORMATS:
+            raise Exception('Unknown layout format: %s' % format)
+
+        self.__cacheDir = os.path.join(cacheDir, 'layout')
+        self.__engine = engine
+        self.__format = format
+        self.__timeout = timeout
+        self.__jobs = jobs
+        self.__flags = list(flags) if flags is not None else []
+
+    def getCacheDir(self):
+        return self.__cacheDir
+
+    def getArguments(self):
+        return [self.__engine, '-T%s' % self.__format] + self.__flags
+
+    def getCacheFile(self, source):
+        digest = hashlib.sha256()
+        digest.update('\0'.join(self.getArguments()).encode('utf-8'))
+        digest.update(b'\0')
+        with open(source, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b''):
+                digest.update(chunk)
+
+        return os.path.join(self.__cacheDir, '%s.%s' % (digest.hexdigest(), self.__format))
+
+    def getOutputFile(self, source):
+        return '%s.%s' % (os.path.splitext(source)[0], self.__format)
+
+    def run(self, sources):
+        if shutil.which(self.__engine) is None:
+            raise ToolNotFoundError('Graphviz %s is required for the layout' % self.__engine)
+
+        os.makedirs(self.__cacheDir, exist_ok = True)
+
+        if self.__jobs <= 1 or len(sources) <= 1:
+            return [self.__layout(source) for source in sources]
+
+        with ThreadPoolExecutor(max_workers = self.__jobs) as executor:
+            return list(executor.map(self.__layout, sources))
+
+    def __layout(self, source):
+        result = {'source': source, 'output': self.getOutputFile(source), 'cached': False, 'seconds': 0.0, 'error': None}
+
+        start = time.perf_counter()
+        cacheFile = self.getCacheFile(source)
+        if os.path.exists(cacheFile):
+            shutil.copyfile(cacheFile, result['output'])
+            result['cached'] = True
+            result['seconds'] = time.perf_counter() - start
+            return result
+
+        tmpFile = '%s.%d.%d.tmp' % (cacheFile, os.getpid(), id(result))
+        try:
+            process = subprocess.run(
+                self.getArguments() + ['-o', tmpFile, source],
+                stdout = subprocess.DEVNULL, stderr = subprocess.PIPE, timeout = self.__timeout
+            )
+            if process.returncode != 0:
+                result['error'] = process.stderr.decode('utf-8', 'replace').strip() or \
+                    '%s exited with %d' % (self.__engine, process.returncode)
+            elif not os.path.exists(tmpFile):
+                result['error'] = '%s wrote no output' % self.__engine
+            else:
+                os.replace(tmpFile, cacheFile)
+                shutil.copyfile(cacheFile, result['output'])
+        except subprocess.TimeoutExpired:
+            result['error'] = '%s timed out after %s seconds' % (self.__engine, self.__timeout)
+        finally:
+            if os.path.exists(tmpFile):
+                os.remove(tmpFile)
+
+        result['seconds'] = time.perf_counter() - start
+
+        return result
+
+    def clear(self):
+        if not os.path.isdir(self.__cacheDir):
+            return 0
+
+        removed = 0
+        for entry in os.scandir(self.__cacheDir):
+            if os.path.splitext(entry.name)[1][1:] in LayoutRunner.FORMATS:
+                os.remove(entry.path)
+                removed += 1
+
+        return removed
+
+    @staticmethod
+    def summary(results):
+        lines = []
+        for result in results:
+            if result['error'] is not None:
+                lines.append('%s: layout failed: %s' % (result['source'], result['error']))
+            else:
+                lines.append('%s: %s in %.3f s%s' % (
+                    result['source'], result['output'], result['seconds'], ' (cached)' if result['cached'] else ''
+                ))
+
+        return '\n'.join(lines)
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .layout import ToolNotFoundError
+
+class MediaIndex():
+    def __init__(self, directory = './Media', fallback = None):
+        self.__directory = os.path.realpath(directory)
+        self.__fallback = fallback
+        self.__files = {}
+        self.__lookups = 0
+
+        self.__scan()
+
+    def __scan(self):
+        if not os.path.isdir(self.__directory):
+            return
+
+        with os.scandir(self.__directory) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    self.__files[entry.name] = os.path.realpath(entry.path)
+                elif entry.is_file():
+                    self.__files[entry.name] = entry.path
+
+    def getDirectory(self):
+        return self.__directory
+
+    def getFallback(self):
+        return self.__fallback
+
+    def contains(self, name):
+        return name in self.__files or (self.__fallback is not None and self.__fallback.contains(name))
+
+    def getLookupCount(self):
+        return self.__lookups
+
+    def getPath(self, name):
+        self.__lookups += 1
+        path = self.__files.get(name)
+        if path is not None:
+            return path
+
+        if self.__fallback is not None:
+            return self.__fallback.getPath(name)
+
+        return os.path.join(self.__directory, name)
+
+    def findMissing(self, names):
+        return sorted(set(name for name in names if not self.contains(name)))
+
+    def __len__(self):
+        return len(self.__files)
+
+class MediaPreparer():
+    SIZE = '768x768'
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, cacheDir, sourceDir = './Media', jobs = 1, size = SIZE):
+        self.__source = MediaIndex(sourceDir)
+        self.__cacheDir = os.path.join(cacheDir, 'media')
+        self.__jobs = jobs
+        self.__size = size
+
+    def getCacheDir(self):
+        return self.__cacheDir
+
+    def getIndex(self):
+        return MediaIndex(self.__cacheDir, self.__source)
+
+    @staticmethod
+    def collect(tree):
+        names = set()
+        for individual in tree.getIndividuals():
+            names.update(individual.getGedcom().getFiles())
+
+        return sorted(names)
+
+    def prepare(self, names):
+        if shutil.which('convert') is None:
+            raise ToolNotFoundError('ImageMagick convert is required for preparing media')
+
+        os.makedirs(self.__cacheDir, exist_ok = True)
+        manifest = self.__loadManifest()
+
+        missing = [name for name in names if not self.__source.contains(name)]
+        available = [name for name in names if self.__source.contains(name)]
+
+        with ThreadPoolExecutor(max_workers = self.__jobs) as executor:
+            results = list(executor.map(lambda name: self.__prepareFile(name, manifest.get(name)), available))
+
+        summary = {'resized': [], 'skipped': [], 'failed': [], 'missing': missing}
+        for name, state, entry in results:
+            summary[state].append(name)
+            if entry is not None:
+                manifest[name] = entry
+            else:
+                manifest.pop(name, None)
+
+        self.__saveManifest(manifest)
+
+        return summary
+
+    def __prepareFile(self, name, entry):
+        source = self.__source.getPath(name)
+        target = os.path.join(self.__cacheDir, name)
+        stat = os.stat(source)
+
+        if entry is not None and entry.get('size') == self.__size and os.path.exists(target):
+            if entry.get('bytes') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                return name, 'skipped', entry
+
+            digest = self.__hashFile(source)
+            if entry.get('sha256') == digest:
+                return name, 'skipped', dict(entry, bytes = stat.st_size, mtime_ns = stat.st_mtime_ns)
+        else:
+            digest = self.__hashFile(source)
+
+        temporary = os.path.join(self.__cacheDir, '.tmp-%s' % name)
+        process = subprocess.run(
+            ['convert', '%s[%s]' % (source, self.__size), temporary],
+            stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL
+        )
+        if process.returncode != 0 or not os.path.exists(temporary):
+            for path in (temporary, target):
+                if os.path.exists(path):
+                    os.remove(path)
+            return name, 'failed', None
+
+        os.replace(temporary, target)
+
+        return name, 'resized', {
+            'sha256': digest, 'size': self.__size, 'bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns
+        }
+
+    def __hashFile(self, filename):
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as fp:
+            for block in iter(lambda: fp.read(1 << 20), b''):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def __loadManifest(self):
+        try:
+            with open(os.path.join(self.__cacheDir, MediaPreparer.MANIFEST), 'r', encoding = 'utf-8') as fp:
+                manifest = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+        return manifest if isinstance(manifest, dict) else {}
+
+    def __saveManifest(self, manifest):
+        filename = os.path.join(self.__cacheDir, MediaPreparer.MANIFEST)
+        temporary = '%s.%d.tmp' % (filename, os.getpid())
+        with open(temporary, 'w', encoding = 'utf-8') as fp:
+            json.dump(manifest, fp, indent = 1, sort_keys = True)
+
+        os.replace(temporary, filename)
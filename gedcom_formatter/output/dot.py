@@ -0,0 +1,96 @@
+import re as regex
+from contextlib import contextmanager
+
+class DotWriter():
+    BUFFER_SIZE = 1 << 20
+
+    KEYWORDS = {'node', 'edge', 'graph', 'digraph', 'subgraph', 'strict'}
+
+    __idRegex = regex.compile(r'([a-zA-Z_][a-zA-Z0-9_]*|-?(\.[0-9]+|[0-9]+(\.[0-9]*)?))$')
+    __htmlRegex = regex.compile(r'<.*>$', regex.DOTALL)
+    __quoteRegex = regex.compile(r'(?P<backslashes>(?:\\{2})*)\\?"')
+
+    def __init__(self, fp, indent = '\t'):
+        self.__fp = fp
+        self.__indent = indent
+        self.__quoted = {}
+
+    @staticmethod
+    def quote(identifier):
+        if DotWriter.__htmlRegex.match(identifier):
+            return identifier
+
+        if DotWriter.__idRegex.match(identifier) and identifier.lower() not in DotWriter.KEYWORDS:
+            return identifier
+
+        return '"%s"' % DotWriter.__quoteRegex.sub(r'\g<backslashes>\\"', identifier)
+
+    @staticmethod
+    @contextmanager
+    def open(filename, name, graphAttr = None, nodeAttr = None, edgeAttr = None):
+        with open(filename, 'w', encoding = 'utf-8', buffering = DotWriter.BUFFER_SIZE) as fp:
+            with DotWriter.digraph(fp, name, graphAttr, nodeAttr, edgeAttr) as writer:
+                yield writer
+
+    @staticmethod
+    @contextmanager
+    def digraph(fp, name, graphAttr = None, nodeAttr = None, edgeAttr = None):
+        fp.write('digraph %s {\n' % DotWriter.quote(name))
+
+        writer = DotWriter(fp)
+        for keyword, attrs in (('graph', graphAttr), ('node', nodeAttr), ('edge', edgeAttr)):
+            if attrs:
+                writer.__write('%s [%s]' % (keyword, writer.__attributes(None, attrs)))
+
+        yield writer
+
+        fp.write('}\n')
+
+    def attr(self, **attrs):
+        self.__write(self.__attributes(None, attrs))
+
+    def node(self, name, label = None, **attrs):
+        self.__write('%s%s' % (self.__quote(name), self.__attributeList(label, attrs)))
+
+    def edge(self, tail, head, label = None, **attrs):
+        self.__write('%s -> %s%s' % (self.__quote(tail), self.__quote(head), self.__attributeList(label, attrs)))
+
+    @contextmanager
+    def subgraph(self, name):
+        self.__write('subgraph %s {' % self.__quote(name))
+
+        writer = DotWriter(self.__fp, self.__indent + '\t')
+        writer.__quoted = self.__quoted
+        yield writer
+
+        self.__write('}')
+
+    def __write(self, statement):
+        self.__fp.write(self.__indent)
+        self.__fp.write(statement)
+        self.__fp.write('\n')
+
+    def __quote(self, identifier):
+        quoted = self.__quoted.get(identifier)
+        if quoted is None:
+            quoted = self.__quoted[identifier] = DotWriter.quote(identifier)
+
+        return quoted
+
+    def __attributes(self, label, attrs):
+        result = [] if label is None else ['label=%s' % DotWriter.quote(label)]
+        for key in sorted(attrs):
+            if attrs[key] is not None:
+                result.append('%s=%s' % (self.__quote(key), self.__quote(attrs[key])))
+
+        return ' '.join(result)
+
+    def __attributeList(self, label, attrs):
+        if label is None and len(attrs) == 0:
+            return ''
+
+        attributes = self.__attributes(label, attrs)
+        if not attributes:
+            return ''
+
+        return ' [%s]' % attributes
@@ -1,22 +1,186 @@
-import os
+from contextlib import contextmanager
 
 from graphviz import Digraph
+from ..gedcom import GedcomIndividual
+from ..media import MediaIndex
 from ..tree import FamilyTree
+from .dot import DotWriter
+
+class LabelCache(object):
+    TEMPLATE = ''.join([
+        '<<table border="0" cellborder="0" cellpadding="0" align="center">',
+        '<tr><td><img src="%(image)s" scale="TRUE"/></td></tr>',
+        '<tr><td> </td></tr>',
+        '<tr><td><FONT POINT-SIZE="%(callnameSize)d" FACE="Parisienne">%(callname)s</FONT></td></tr>',
+        '<tr><td><FONT POINT-SIZE="80" FACE="Parisienne">%(birthname)s</FONT></td></tr>',
+        '<tr><td> </td></tr>',
+        '<tr><td><FONT POINT-SIZE="64" FACE="Sacramento">%(birthdate)s </FONT></td></tr>',
+        '<tr><td><FONT POINT-SIZE="64" FACE="Sacramento">%(deathdate)s </FONT></td></tr>',
+        '</table>>'
+    ])
+
+    MALE_IMAGE = './male.png'
+
+    FEMALE_IMAGE = './female.png'
+
+    def __init__(self, media: MediaIndex = None):
+        self.__media = media if media is not None else MediaIndex()
+        self.__labels = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    def getMedia(self):
+        return self.__media
+
+    def getHitCount(self):
+        return self.__hits
+
+    def getMissCount(self):
+        return self.__misses
+
+    def getLabel(self, gedcom: GedcomIndividual):
+        cached = self.__labels.get(gedcom.getId())
+        if cached is not None and cached[0] is gedcom:
+            self.__hits += 1
+            return cached[1]
+
+        self.__misses += 1
+        label = self.__renderLabel(gedcom)
+        self.__labels[gedcom.getId()] = (gedcom, label)
+
+        return label
+
+    def __renderLabel(self, gedcom):
+        if gedcom.isFile():
+            image = self.__media.getPath(gedcom.getFile())
+        elif gedcom.isMale():
+            image = LabelCache.MALE_IMAGE
+        else:
+            image = LabelCache.FEMALE_IMAGE
+
+        callname = gedcom.getCallname()
+
+        birthdate = ''
+        if gedcom.isBirthdate():
+            birthdate = '&#x2733; ' + gedcom.getBirthdateFormatted()
+
+        deathdate = ''
+        if gedcom.isDeathdate():
+            deathdate = '&#x271D; ' + gedcom.getDeathdateFormatted()
+
+        return LabelCache.TEMPLATE % {
+            'image': image,
+            'callnameSize': LabelCache.getCallnameSize(callname),
+            'callname': callname,
+            'birthname': gedcom.getBirthname(),
+            'birthdate': birthdate,
+            'deathdate': deathdate
+        }
+
+    @staticmethod
+    def getCallnameSize(callname):
+        if len(callname) > 10:
+            return 92
+        if len(callname) > 8:
+            return 104
+
+        return 128
+
+    def __len__(self):
+        return len(self.__labels)
+
+class CountingGraph(object):
+    def __init__(self, graph, counts = None):
+        self.__graph = graph
+        self.__counts = counts if counts is not None else {'nodes': 0, 'edges': 0}
+
+    def getCounts(self):
+        return self.__counts
+
+    def attr(self, **attrs):
+        self.__graph.attr(**attrs)
+
+    def node(self, name, label = None, **attrs):
+        self.__counts['nodes'] += 1
+        self.__graph.node(name, label, **attrs)
+
+    def edge(self, tail, head, label = None, **attrs):
+        self.__counts['edges'] += 1
+        self.__graph.edge(tail, head, label, **attrs)
+
+    @contextmanager
+    def subgraph(self, name):
+        with self.__graph.subgraph(name = name) as graph:
+            yield CountingGraph(graph, self.__counts)
 
 class Graphviz(object):
-    def __init__(self, tree: FamilyTree):
+    NAME = 'family_tree'
+
+    GRAPH_ATTR = {'splines': 'line', 'center': 'true', 'nodesep': '1.0', 'ranksep': '3.2'}
+
+    NODE_ATTR = {'shape': 'circle', 'height': '0.0', 'width': '0.0'}
+
+    EDGE_ATTR = {'dir': 'none', 'penwidth': '30.0'}
+
+    def __init__(self, tree: FamilyTree, stream = False, labels: LabelCache = None):
         self.__tree = tree
+        self.__stream = stream
+        self.__labels = labels if labels is not None else LabelCache()
+        self.__counts = {'nodes': 0, 'edges': 0}
+
+    def getLabels(self):
+        return self.__labels
+
+    def getNodeCount(self):
+        return self.__counts['nodes']
+
+    def getEdgeCount(self):
+        return self.__counts['edges']
+
+    def renderLabels(self):
+        for individual in self.__tree.getIndividuals():
+            self.__labels.getLabel(individual.getGedcom())
+
+    def getMissingMedia(self):
+        return self.__labels.getMedia().findMissing(
+            individual.getGedcom().getFile() for individual in self.__tree.getIndividuals()
+            if individual.getGedcom().isFile()
+        )
+
+    def render(self, filename = None):
+        if filename is None:
+            filename = '%s.gv' % Graphviz.NAME
+
+        self.__counts['nodes'] = self.__counts['edges'] = 0
+
+        if self.__stream:
+            with DotWriter.open(
+                filename, Graphviz.NAME, Graphviz.GRAPH_ATTR, Graphviz.NODE_ATTR, Graphviz.EDGE_ATTR
+            ) as g:
+                self.__renderGraph(CountingGraph(g, self.__counts))
+
+            return filename
 
-    def render(self):
         g = Digraph(
-            name = 'family_tree', format = 'svg', engine = 'dot',
-            graph_attr = {'splines': 'line', 'center': 'true', 'nodesep': '1.0', 'ranksep': '3.2'},
-            node_attr = {'shape': 'circle', 'height': '0.0', 'width': '0.0'},
-            edge_attr = {'dir': 'none', 'penwidth': '30.0'}
+            name = Graphviz.NAME, format = 'svg', engine = 'dot',
+            graph_attr = Graphviz.GRAPH_ATTR, node_attr = Graphviz.NODE_ATTR, edge_attr = Graphviz.EDGE_ATTR
         )
+        self.__renderGraph(CountingGraph(g, self.__counts))
+
+        return g.save(filename)
+
+    def renderTo(self, fp):
+        self.__counts['nodes'] = self.__counts['edges'] = 0
+
+        with DotWriter.digraph(
+            fp, Graphviz.NAME, Graphviz.GRAPH_ATTR, Graphviz.NODE_ATTR, Graphviz.EDGE_ATTR
+        ) as g:
+            self.__renderGraph(CountingGraph(g, self.__counts))
 
+    def __renderGraph(self, g):
         rootFamily = self.__tree.getRootFamily()
-        g.attr(root = rootFamily.getId())
+        if rootFamily is not None:
+            g.attr(root = rootFamily.getId())
         g.attr(center = 'true')
 
         curGeneration = self.__tree.getRootGeneration()
@@ -25,7 +189,7 @@ class Graphviz(object):
                 gen.attr(rank = 'same')
 
                 curInd = curGeneration.getFirst()
-                nextInd = curInd.getNextSibling()
+                nextInd = curInd.getNextSibling() if curInd is not None else None
                 while nextInd is not None:
                     betweenNode = '%sBetween%s' % (curInd.getId(), nextInd.getId())
 
@@ -46,12 +210,14 @@ class Graphviz(object):
         
             curGeneration = curGeneration.getNextGeneration()
 
-        self.__renderFamily(rootFamily, g)
+        rendered = set()
+        for family in self.__tree.getRootFamilies():
+            self.__renderFamily(family, g, rendered)
 
         for individual in self.__tree.getIndividuals():
             id = individual.getId()
             g.node(
-                id, label = self.__renderLabel(individual), 
+                id, label = self.__labels.getLabel(individual.getGedcom()), 
                 shape = 'invhouse', width = '10', height = '25',
                 penwidth = '2.0', style = 'filled', fillcolor = 'lightgrey:antiquewhite',
                 gradientangle = '135'
@@ -63,10 +229,12 @@ class Graphviz(object):
 
                 g.edge('%sChild' % id, id, label = None, weight = '10')
 
-        g.save()
-
-    def __renderFamily(self, family, graph):
+    def __renderFamily(self, family, graph, rendered):
         id = family.getId()
+        if id in rendered:
+            return
+        rendered.add(id)
+
         partners = family.getPartners()
         with graph.subgraph(name = 'Family%s' % id) as f:
             with f.subgraph(name = 'Partners%s' % id) as p:
@@ -75,7 +243,8 @@ class Graphviz(object):
                 p.node(id, label = '')    
 
                 p.edge(partners[0].getId(), id, label = None, weight = '10')
-                p.edge(id, partners[1].getId(), label = None, weight = '10')
+                if len(partners) > 1:
+                    p.edge(id, partners[1].getId(), label = None, weight = '10')
                     
             if family.hasChilds():
                 childs = family.getChilds()
@@ -98,44 +267,4 @@ class Graphviz(object):
                     )
 
                     for childFamily in child.getFamilies():
-                        self.__renderFamily(childFamily, f)
-
-    def __renderLabel(self, individual):
-        gedcom = individual.getGedcom()
-
-        label = '<<table border="0" cellborder="0" cellpadding="0" align="center">'
-
-        if gedcom.isFile():
-            imgSrc = os.path.realpath('./Media/%s' % gedcom.getFile())
-        else:
-            if individual.isMale():
-                imgSrc = './male.png'
-            else:
-                imgSrc = './female.png'
-
-        callname = gedcom.getCallname()
-        if len(callname) > 10:
-            callnameSize = 92
-        elif len(callname) > 8:
-            callnameSize = 104
-        else:
-            callnameSize = 128
-
-        birthdate = ''
-        if gedcom.isBirthdate():
-            birthdate = '&#x2733; ' + gedcom.getBirthdateFormatted()
-        
-        deathdate = ''
-        if gedcom.isDeathdate():
-            deathdate = '&#x271D; ' + gedcom.getDeathdateFormatted()
-
-        label += '<tr><td><img src="%s" scale="TRUE"/></td></tr>' % imgSrc
-        label += '<tr><td> </td></tr>'
-        label += '<tr><td><FONT POINT-SIZE="%d" FACE="Parisienne">%s</FONT></td></tr>' % (callnameSize, callname)
-        label += '<tr><td><FONT POINT-SIZE="80" FACE="Parisienne">%s</FONT></td></tr>' % gedcom.getBirthname()
-        label += '<tr><td> </td></tr>'
-        label += '<tr><td><FONT POINT-SIZE="64" FACE="Sacramento">%s </FONT></td></tr>' % birthdate
-        label += '<tr><td><FONT POINT-SIZE="64" FACE="Sacramento">%s </FONT></td></tr>' % deathdate
-        label += '</table>>'
-
-        return label
+                        self.__renderFamily(childFamily, f, rendered)
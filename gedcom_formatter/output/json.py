@@ -0,0 +1,53 @@
+import json
+
+from ..tree import FamilyTree
+from .records import TreeRecords
+
+class JsonWriter():
+    NAME = 'family_tree'
+
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, tree: FamilyTree):
+        self.__records = TreeRecords(tree)
+        self.__encode = json.JSONEncoder(ensure_ascii = False, separators = (',', ':')).encode
+
+    def render(self, filename = None):
+        if filename is None:
+            filename = '%s.json' % JsonWriter.NAME
+
+        with open(filename, 'w', encoding = 'utf-8', buffering = JsonWriter.BUFFER_SIZE) as fp:
+            self.renderTo(fp)
+
+        return filename
+
+    def renderTo(self, fp):
+        encode = self.__encode
+
+        fp.write('{')
+        for key, value in self.__records.getHeader().items():
+            fp.write('%s:%s,\n' % (encode(key), encode(value)))
+
+        self.__writeArray(fp, 'generations', self.__records.iterGenerations())
+        fp.write(',\n')
+        self.__writeArray(fp, 'individuals', (
+            dict(zip(TreeRecords.INDIVIDUAL_FIELDS, individual)) for individual in self.__records.iterIndividuals()
+        ))
+        fp.write(',\n')
+        self.__writeArray(fp, 'families', (
+            dict(zip(TreeRecords.FAMILY_FIELDS, family)) for family in self.__records.iterFamilies()
+        ))
+        fp.write(',\n')
+        self.__writeArray(fp, 'links', self.__records.iterLinks())
+        fp.write('}\n')
+
+    def __writeArray(self, fp, key, items):
+        encode = self.__encode
+
+        fp.write('%s:[' % encode(key))
+        separator = '\n'
+        for item in items:
+            fp.write(separator)
+            fp.write(encode(item))
+            separator = ',\n'
+        fp.write('\n]')
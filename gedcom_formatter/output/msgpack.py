@@ -0,0 +1,145 @@
+import struct
+
+from ..tree import FamilyTree
+from .records import TreeRecords
+
+class MsgpackWriter():
+    NAME = 'family_tree'
+
+    BUFFER_SIZE = 1 << 20
+
+    STRING_REFERENCE = 1
+
+    MIN_INTERNED = 3
+
+    def __init__(self, tree: FamilyTree):
+        self.__records = TreeRecords(tree)
+        self.__strings = {}
+
+    def getStringCount(self):
+        return len(self.__strings)
+
+    def render(self, filename = None):
+        if filename is None:
+            filename = '%s.msgpack' % MsgpackWriter.NAME
+
+        with open(filename, 'wb', buffering = MsgpackWriter.BUFFER_SIZE) as fp:
+            self.renderTo(fp)
+
+        return filename
+
+    def renderTo(self, fp):
+        self.__strings = {}
+        header = self.__records.getHeader()
+        counts = header['counts']
+
+        buffer = bytearray()
+        self.__packMapHeader(buffer, len(header) + 4)
+        for key, value in header.items():
+            self.__pack(buffer, key)
+            self.__pack(buffer, value)
+        fp.write(buffer)
+
+        for key, count, items in (
+            ('generations', counts['generations'], self.__records.iterGenerations()),
+            ('individuals', counts['individuals'], self.__records.iterIndividuals()),
+            ('families', counts['families'], self.__records.iterFamilies()),
+            ('links', counts['links'], self.__records.iterLinks())
+        ):
+            buffer = bytearray()
+            self.__pack(buffer, key)
+            self.__packArrayHeader(buffer, count)
+
+            for item in items:
+                self.__pack(buffer, item)
+                if len(buffer) >= MsgpackWriter.BUFFER_SIZE:
+                    fp.write(buffer)
+                    buffer = bytearray()
+
+            fp.write(buffer)
+
+    def __pack(self, buffer, value):
+        if value is None:
+            buffer.append(0xc0)
+        elif value is True:
+            buffer.append(0xc3)
+        elif value is False:
+            buffer.append(0xc2)
+        elif isinstance(value, int):
+            self.__packInt(buffer, value)
+        elif isinstance(value, str):
+            self.__packString(buffer, value)
+        elif isinstance(value, (list, tuple)):
+            self.__packArrayHeader(buffer, len(value))
+            for item in value:
+                self.__pack(buffer, item)
+        elif isinstance(value, dict):
+            self.__packMapHeader(buffer, len(value))
+            for key, item in value.items():
+                self.__pack(buffer, key)
+                self.__pack(buffer, item)
+        else:
+            raise Exception('Cannot pack %s' % type(value).__name__)
+
+    def __packInt(self, buffer, value):
+        if 0 <= value < 0x80:
+            buffer.append(value)
+        elif -0x20 <= value < 0:
+            buffer.append(value & 0xff)
+        elif 0 <= value <= 0xff:
+            buffer += struct.pack('>BB', 0xcc, value)
+        elif 0 <= value <= 0xffff:
+            buffer += struct.pack('>BH', 0xcd, value)
+        elif 0 <= value <= 0xffffffff:
+            buffer += struct.pack('>BI', 0xce, value)
+        elif value > 0:
+            buffer += struct.pack('>BQ', 0xcf, value)
+        elif value >= -0x80:
+            buffer += struct.pack('>Bb', 0xd0, value)
+        elif value >= -0x8000:
+            buffer += struct.pack('>Bh', 0xd1, value)
+        elif value >= -0x80000000:
+            buffer += struct.pack('>Bi', 0xd2, value)
+        else:
+            buffer += struct.pack('>Bq', 0xd3, value)
+
+    def __packString(self, buffer, value):
+        index = self.__strings.get(value)
+        if index is not None:
+            if index <= 0xff:
+                buffer += struct.pack('>BbB', 0xd4, MsgpackWriter.STRING_REFERENCE, index)
+            elif index <= 0xffff:
+                buffer += struct.pack('>BbH', 0xd5, MsgpackWriter.STRING_REFERENCE, index)
+            else:
+                buffer += struct.pack('>BbI', 0xd6, MsgpackWriter.STRING_REFERENCE, index)
+            return
+
+        data = value.encode('utf-8')
+        if len(data) >= MsgpackWriter.MIN_INTERNED:
+            self.__strings[value] = len(self.__strings)
+
+        if len(data) < 0x20:
+            buffer.append(0xa0 | len(data))
+        elif len(data) <= 0xff:
+            buffer += struct.pack('>BB', 0xd9, len(data))
+        elif len(data) <= 0xffff:
+            buffer += struct.pack('>BH', 0xda, len(data))
+        else:
+            buffer += struct.pack('>BI', 0xdb, len(data))
+        buffer += data
+
+    def __packArrayHeader(self, buffer, count):
+        if count < 0x10:
+            buffer.append(0x90 | count)
+        elif count <= 0xffff:
+            buffer += struct.pack('>BH', 0xdc, count)
+        else:
+            buffer += struct.pack('>BI', 0xdd, count)
+
+    def __packMapHeader(self, buffer, count):
+        if count < 0x10:
+            buffer.append(0x80 | count)
+        elif count <= 0xffff:
+            buffer += struct.pack('>BH', 0xde, count)
+        else:
+            buffer += struct.pack('>BI', 0xdf, count)
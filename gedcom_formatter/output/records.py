@@ -0,0 +1,89 @@
+from ..tree import FamilyTree
+
+class TreeRecords():
+    FORMAT = 'gedcom-formatter-tree'
+
+    VERSION = 1
+
+    INDIVIDUAL_FIELDS = (
+        'id', 'level', 'gender', 'title', 'givenname', 'callname', 'surname', 'birthname',
+        'birthdate', 'birthyear', 'birthplace', 'deathdate', 'deathyear', 'deathplace', 'parent', 'families'
+    )
+
+    FAMILY_FIELDS = ('id', 'level', 'partners', 'children', 'marriagedate', 'marriageyear', 'marriageplace')
+
+    def __init__(self, tree: FamilyTree):
+        self.__tree = tree
+
+    def getHeader(self):
+        root = self.__tree.getRootFamily()
+
+        return {
+            'format': TreeRecords.FORMAT,
+            'version': TreeRecords.VERSION,
+            'root': root.getId() if root is not None else None,
+            'individualFields': list(TreeRecords.INDIVIDUAL_FIELDS),
+            'familyFields': list(TreeRecords.FAMILY_FIELDS),
+            'counts': {
+                'generations': len(self.getGenerations()),
+                'individuals': len(self.__tree.getIndividuals()),
+                'families': len(self.__tree.getFamilies()),
+                'links': len(self.__tree.getLinks())
+            }
+        }
+
+    def getGenerations(self):
+        generations = []
+
+        generation = self.__tree.getRootGeneration()
+        while generation is not None:
+            generations.append(generation)
+            generation = generation.getNextGeneration()
+
+        return generations
+
+    def iterGenerations(self):
+        for generation in self.getGenerations():
+            yield [individual.getId() for individual in generation.getIndividuals()]
+
+    def iterIndividuals(self):
+        for individual in self.__tree.getIndividuals():
+            gedcom = individual.getGedcom()
+            parent = individual.getParent()
+
+            yield (
+                individual.getId(),
+                individual.getLevel(),
+                'M' if gedcom.isMale() else 'F' if gedcom.isFemale() else 'U',
+                gedcom.getTitle(),
+                gedcom.getGivenname(),
+                gedcom.getCallname(),
+                gedcom.getSurname(),
+                gedcom.getBirthname(),
+                gedcom.getBirthdateFormatted(),
+                gedcom.getBirthyear(),
+                gedcom.getBirthplace(),
+                gedcom.getDeathdateFormatted(),
+                gedcom.getDeathyear(),
+                gedcom.getDeathplace(),
+                parent.getId() if parent is not None else None,
+                [family.getId() for family in individual.getFamilies()]
+            )
+
+    def iterFamilies(self):
+        for family in self.__tree.getFamilies():
+            gedcom = family.getInfo()
+
+            yield (
+                family.getId(),
+                family.getLevel(),
+                [partner.getId() for partner in family.getPartners()],
+                [child.getId() for child in family.getChilds()],
+                gedcom.getMarriagedateFormatted(),
+                gedcom.getMarriageyear(),
+                gedcom.getMarriageplace()
+            )
+
+    def iterLinks(self):
+        for child, family in self.__tree.getLinks():
+            yield [child.getId(), family.getId()]
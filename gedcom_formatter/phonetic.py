@@ -0,0 +1,106 @@
+import unicodedata
+from functools import lru_cache
+
+ALGORITHMS = ('koelner', 'soundex')
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (('BFPV', '1'), ('CGJKQSXZ', '2'), ('DT', '3'), ('L', '4'), ('MN', '5'), ('R', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+@lru_cache(maxsize = 65536)
+def normalize(word):
+    word = word.casefold().replace('ß', 'ss')
+    decomposed = unicodedata.normalize('NFKD', word)
+
+    return ''.join(char for char in decomposed if char.isalnum())
+
+def tokenize(text):
+    tokens = []
+    for part in text.replace('-', ' ').split():
+        token = normalize(part)
+        if token:
+            tokens.append(token)
+
+    return tokens
+
+@lru_cache(maxsize = 65536)
+def koelner(word):
+    letters = [char for char in normalize(word).upper() if 'A' <= char <= 'Z']
+
+    digits = []
+    for position, char in enumerate(letters):
+        prev = letters[position - 1] if position > 0 else ''
+        next = letters[position + 1] if position + 1 < len(letters) else ''
+
+        if char in 'AEIJOUY':
+            code = '0'
+        elif char == 'H':
+            continue
+        elif char == 'B':
+            code = '1'
+        elif char == 'P':
+            code = '3' if next == 'H' else '1'
+        elif char in 'DT':
+            code = '8' if next in ('C', 'S', 'Z') else '2'
+        elif char in 'FVW':
+            code = '3'
+        elif char in 'GKQ':
+            code = '4'
+        elif char == 'C':
+            if position == 0:
+                code = '4' if next in ('A', 'H', 'K', 'L', 'O', 'Q', 'R', 'U', 'X') else '8'
+            elif prev in ('S', 'Z'):
+                code = '8'
+            else:
+                code = '4' if next in ('A', 'H', 'K', 'O', 'Q', 'U', 'X') else '8'
+        elif char == 'X':
+            code = '8' if prev in ('C', 'K', 'Q') else '48'
+        elif char == 'L':
+            code = '5'
+        elif char in 'MN':
+            code = '6'
+        elif char == 'R':
+            code = '7'
+        else:
+            code = '8'
+
+        digits.append(code)
+
+    collapsed = []
+    for digit in ''.join(digits):
+        if len(collapsed) == 0 or collapsed[-1] != digit:
+            collapsed.append(digit)
+
+    if len(collapsed) == 0:
+        return ''
+
+    return collapsed[0] + ''.join(digit for digit in collapsed[1:] if digit != '0')
+
+@lru_cache(maxsize = 65536)
+def soundex(word):
+    letters = [char for char in normalize(word).upper() if 'A' <= char <= 'Z']
+    if len(letters) == 0:
+        return ''
+
+    code = [letters[0]]
+    last = _SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != last:
+            code.append(digit)
+            if len(code) == 4:
+                break
+
+        if char not in 'HW':
+            last = digit
+
+    return ''.join(code).ljust(4, '0')
+
+def encode(word, algorithm):
+    if algorithm == 'koelner':
+        return koelner(word)
+    if algorithm == 'soundex':
+        return soundex(word)
+
+    raise Exception('Unknown phonetic algorithm: %s' % algorithm)
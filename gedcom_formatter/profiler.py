@@ -0,0 +1,91 @@
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class PhaseProfiler():
+    FORMATS = ('table', 'json')
+
+    def __init__(self, dumpFile = None, profiledPhases = ('parse', 'build')):
+        self.__phases = []
+        self.__counters = {}
+        self.__dumpFile = dumpFile
+        self.__profiledPhases = profiledPhases
+        self.__profile = cProfile.Profile() if dumpFile is not None else None
+
+    @contextmanager
+    def phase(self, name):
+        profiled = self.__profile is not None and name in self.__profiledPhases
+        if profiled:
+            self.__profile.enable()
+
+        peakRss = PhaseProfiler.getPeakRss()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            if profiled:
+                self.__profile.disable()
+
+            if peakRss is not None:
+                peakRss = PhaseProfiler.getPeakRss() - peakRss
+
+            self.__phases.append({'phase': name, 'wall': wall, 'cpu': cpu, 'peakRssGrowth': peakRss})
+
+    @staticmethod
+    def getPeakRss():
+        if resource is None:
+            return None
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            return peak
+
+        return peak * 1024
+
+    def count(self, name, value):
+        self.__counters[name] = value
+
+    def getPhases(self):
+        return self.__phases
+
+    def getCounters(self):
+        return self.__counters
+
+    def dump(self):
+        if self.__profile is None:
+            return None
+
+        self.__profile.dump_stats(self.__dumpFile)
+
+        return self.__dumpFile
+
+    def report(self, format = 'table'):
+        if format == 'json':
+            return json.dumps({'phases': self.__phases, 'counters': self.__counters}, indent = 1)
+
+        lines = ['%-12s %10s %10s %21s' % ('phase', 'wall s', 'cpu s', 'peak RSS growth MiB')]
+        for phase in self.__phases:
+            growth = '-' if phase['peakRssGrowth'] is None else '%.1f' % (phase['peakRssGrowth'] / 2**20)
+            lines.append('%-12s %10.3f %10.3f %21s' % (phase['phase'], phase['wall'], phase['cpu'], growth))
+
+        lines.append('%-12s %10.3f %10.3f' % (
+            'total', sum(phase['wall'] for phase in self.__phases), sum(phase['cpu'] for phase in self.__phases)
+        ))
+
+        if len(self.__counters) > 0:
+            lines.append('')
+            width = max(len(name) for name in self.__counters)
+            for name, value in self.__counters.items():
+                lines.append('%-*s %12s' % (width, name, value))
+
+        return '\n'.join(lines)
@@ -0,0 +1,120 @@
+from bisect import bisect_left
+from itertools import islice
+
+from .phonetic import ALGORITHMS, encode, tokenize
+
+class NameIndex():
+    VERSION = 1
+
+    FIELDS = ('surname', 'given')
+
+    def __init__(self, individuals):
+        entries = []
+        for individual in individuals:
+            surnames = tokenize('%s %s' % (individual.getSurname(), individual.getBirthname()))
+            givens = tokenize('%s %s' % (individual.getGivenname(), individual.getCallname()))
+            entries.append((surnames, givens, individual.getBirthyear(), individual.getId()))
+
+        # Positions are assigned in result order, so every posting list is sorted by rank
+        # and a query can stop as soon as it has found enough matches.
+        entries.sort()
+
+        ids = []
+        years = {}
+        postings = {field: {} for field in NameIndex.FIELDS}
+        for position, (surnames, givens, year, id) in enumerate(entries):
+            ids.append(id)
+
+            for field, tokens in (('surname', surnames), ('given', givens)):
+                for token in set(tokens):
+                    postings[field].setdefault(token, []).append(position)
+
+            if year > 0:
+                years.setdefault(year, []).append(position)
+
+        self.__ids = ids
+        self.__years = {year: tuple(positions) for year, positions in years.items()}
+        self.__postings = {}
+        self.__tokens = {}
+        self.__codes = {}
+        for field in NameIndex.FIELDS:
+            self.__postings[field] = {token: tuple(positions) for token, positions in postings[field].items()}
+            self.__tokens[field] = sorted(postings[field])
+            self.__codes[field] = {}
+            for algorithm in ALGORITHMS:
+                codes = {}
+                for token, positions in postings[field].items():
+                    codes.setdefault(encode(token, algorithm), set()).update(positions)
+                self.__codes[field][algorithm] = {code: tuple(sorted(positions)) for code, positions in codes.items()}
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def search(self, surname = None, given = None, year = None, tolerance = 0, phonetic = None, limit = None):
+        if phonetic is not None and phonetic not in ALGORITHMS:
+            raise Exception('Unknown phonetic algorithm: %s' % phonetic)
+
+        candidates = []
+        for field, text in (('surname', surname), ('given', given)):
+            if text is None:
+                continue
+
+            tokens = tokenize(text)
+            if len(tokens) == 0:
+                return []
+
+            for token in tokens:
+                candidates.append(self.__lookup(field, token, phonetic))
+
+        if year is not None:
+            candidates.append([
+                self.__years[candidate] for candidate in range(year - tolerance, year + tolerance + 1)
+                if candidate in self.__years
+            ])
+
+        if len(candidates) == 0:
+            return []
+
+        return [self.__ids[position] for position in islice(NameIndex.__intersect(candidates), limit)]
+
+    def __lookup(self, field, token, phonetic):
+        if phonetic is not None:
+            positions = self.__codes[field][phonetic].get(encode(token, phonetic))
+            return [positions] if positions is not None else []
+
+        tokens = self.__tokens[field]
+        postings = self.__postings[field]
+
+        start = bisect_left(tokens, token)
+        end = bisect_left(tokens, token + '￿', start)
+
+        return [postings[tokens[position]] for position in range(start, end)]
+
+    @staticmethod
+    def __intersect(candidates):
+        if len(candidates) == 1 and len(candidates[0]) == 1:
+            yield from candidates[0][0]
+            return
+
+        target = 0
+        while True:
+            for lists in candidates:
+                position = NameIndex.__seek(lists, target)
+                if position is None:
+                    return
+                if position > target:
+                    target = position
+                    break
+            else:
+                yield target
+                target += 1
+
+    @staticmethod
+    def __seek(lists, target):
+        found = None
+        for positions in lists:
+            index = bisect_left(positions, target)
+            if index < len(positions) and (found is None or positions[index] < found):
+                found = positions[index]
+
+        return found
@@ -0,0 +1,228 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from .cache import GedcomCache
+from .layout import LayoutRunner
+from .treecache import LRUCache, TreeCache
+from .output.graphviz import Graphviz, LabelCache
+from .output.json import JsonWriter
+from .output.msgpack import MsgpackWriter
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+
+class TreeService():
+    FORMATS = {
+        'dot': 'text/vnd.graphviz; charset=utf-8',
+        'svg': 'image/svg+xml',
+        'json': 'application/json; charset=utf-8',
+        'msgpack': 'application/msgpack'
+    }
+
+    MAX_DEPTH = 100
+
+    STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+    def __init__(
+        self, filename, cacheDir = None, maxTrees = 32, maxOutputs = 64, jobs = 1,
+        layoutTimeout = None, pollInterval = 2.0
+    ):
+        self.__filename = filename
+        self.__cache = GedcomCache(cacheDir)
+        self.__layout = LayoutRunner(self.__cache.getCacheDir(), timeout = layoutTimeout)
+        self.__maxTrees = maxTrees
+        self.__trees = TreeCache(None, maxTrees)
+        self.__outputs = LRUCache(maxOutputs)
+        self.__executor = ThreadPoolExecutor(max_workers = jobs)
+        self.__pollInterval = pollInterval
+
+        self.__labels = None
+        self.__mtime = None
+        self.__generation = 0
+        self.__reloadLock = None
+        self.__pending = {}
+
+    async def start(self, host, port):
+        self.__reloadLock = asyncio.Lock()
+        await self.__reload()
+
+        server = await asyncio.start_server(self.__handle, host, port)
+        asyncio.get_running_loop().create_task(self.__watch())
+
+        return server
+
+    async def __reload(self):
+        async with self.__reloadLock:
+            mtime = os.stat(self.__filename).st_mtime_ns
+            if mtime == self.__mtime:
+                return False
+
+            loop = asyncio.get_running_loop()
+            gedcom = await loop.run_in_executor(self.__executor, self.__cache.getOrParse, self.__filename)
+
+            self.__labels = LabelCache()
+            self.__mtime = mtime
+            self.__generation += 1
+            self.__trees = TreeCache(gedcom, self.__maxTrees)
+            self.__outputs.clear()
+
+            return True
+
+    async def __watch(self):
+        while True:
+            await asyncio.sleep(self.__pollInterval)
+            try:
+                if await self.__reload():
+                    print('Reloaded %s' % self.__filename, flush = True)
+            except Exception as e:
+                print('Reloading %s failed: %s' % (self.__filename, e), flush = True)
+
+    async def getTree(self, root, depth, ancestors = False):
+        key = (self.__generation, root, depth, ancestors)
+
+        return await self.__once(key, self.__buildTree, self.__trees, root, depth, ancestors)
+
+    async def getOutput(self, root, depth, ancestors, format):
+        key = (self.__generation, root, depth, ancestors, format)
+        output = self.__outputs.get(key)
+        if output is not None:
+            return output
+
+        tree = await self.getTree(root, depth, ancestors)
+        output = await self.__once(key, self.__render, tree, self.__labels, format)
+        if key[0] == self.__generation:
+            self.__outputs.put(key, output)
+
+        return output
+
+    async def __once(self, key, function, *arguments):
+        future = self.__pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.__executor, function, *arguments)
+            self.__pending[key] = future
+            future.add_done_callback(lambda _: self.__pending.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    def __buildTree(self, trees, root, depth, ancestors):
+        try:
+            return trees.get(root, depth, ancestors)
+        except KeyError:
+            raise RequestError(404, 'Unknown root %s' % root)
+
+    def __render(self, tree, labels, format):
+        if format == 'json':
+            fp = io.StringIO()
+            JsonWriter(tree).renderTo(fp)
+            return fp.getvalue().encode('utf-8')
+
+        if format == 'msgpack':
+            fp = io.BytesIO()
+            MsgpackWriter(tree).renderTo(fp)
+            return fp.getvalue()
+
+        renderer = Graphviz(tree, True, labels)
+        if format == 'dot':
+            fp = io.StringIO()
+            renderer.renderTo(fp)
+            return fp.getvalue().encode('utf-8')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source = renderer.render(os.path.join(tmp, 'family_tree.gv'))
+            result = self.__layout.run([source])[0]
+            if result['error'] is not None:
+                raise Exception(result['error'])
+
+            with open(result['output'], 'rb') as fp:
+                return fp.read()
+
+    async def __handle(self, reader, writer):
+        start = time.perf_counter()
+        status, contentType, body = 500, 'text/plain; charset=utf-8', b''
+        target = '-'
+
+        try:
+            requestLine = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+
+            parts = requestLine.split(' ')
+            if len(parts) != 3:
+                raise RequestError(400, 'Malformed request line')
+
+            method, target, _ = parts
+            if method != 'GET':
+                raise RequestError(405, 'Only GET is supported')
+
+            status, contentType, body = 200, *await self.__route(target)
+        except RequestError as e:
+            status, body = e.status, ('%s\n' % e).encode('utf-8')
+        except Exception as e:
+            status, body = 500, ('%s: %s\n' % (type(e).__name__, e)).encode('utf-8')
+
+        writer.write((
+            'HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\nConnection: close\r\n\r\n' % (
+                status, TreeService.STATUS.get(status, ''), contentType, len(body)
+            )
+        ).encode('latin-1'))
+        writer.write(body)
+
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+        print('%d %s %.1f ms' % (status, target, (time.perf_counter() - start) * 1000), flush = True)
+
+    async def __route(self, target):
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == '/status':
+            return 'application/json; charset=utf-8', json.dumps({
+                'filename': self.__filename,
+                'generation': self.__generation,
+                'trees': self.__trees.getStatistics(),
+                'outputs': self.__outputs.getStatistics()
+            }).encode('utf-8')
+
+        if url.path != '/tree':
+            raise RequestError(404, 'Unknown path %s' % url.path)
+
+        root = query.get('root')
+        if not root:
+            raise RequestError(400, 'Missing parameter root')
+
+        try:
+            depth = int(query.get('depth', '1'))
+        except ValueError:
+            raise RequestError(400, 'Parameter depth must be a number')
+        if not 1 <= depth <= TreeService.MAX_DEPTH:
+            raise RequestError(400, 'Parameter depth must be between 1 and %d' % TreeService.MAX_DEPTH)
+
+        format = query.get('format', 'dot')
+        if format not in TreeService.FORMATS:
+            raise RequestError(400, 'Parameter format must be one of %s' % ', '.join(TreeService.FORMATS))
+
+        ancestors = query.get('ancestors', '') in ('1', 'true', 'yes')
+
+        return TreeService.FORMATS[format], await self.getOutput(root, depth, ancestors, format)
+
+    async def serveForever(self, host, port):
+        server = await self.start(host, port)
+        print('Serving %s on http://%s:%d/tree?root=...&depth=...&format=dot|svg|json|msgpack' % (
+            self.__filename, host, port
+        ), flush = True)
+
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,203 @@
+import os
+import re as regex
+import time
+
+from .index import GedcomIndex
+
+class SubsetWriter():
+    NAME = 'family_tree'
+
+    BUFFER_SIZE = 1 << 20
+
+    TREE_TAGS = ('INDI', 'FAM')
+
+    HEAD_TAGS = (b'GEDC', b'CHAR', b'LANG', b'SUBM')
+
+    DEFAULT_HEAD = {
+        b'GEDC': [b'1 GEDC', b'2 VERS 5.5.1', b'2 FORM LINEAGE-LINKED'],
+        b'CHAR': [b'1 CHAR UTF-8']
+    }
+
+    MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+    __pointerRegex = regex.compile(rb'[ \t]@([^@#\r\n][^@\r\n]*)@[ \t]*\r?$', regex.MULTILINE)
+    __lineRegex = regex.compile(rb'\n[ \t]*(\d+)')
+
+    def __init__(self, filename):
+        self.__index = GedcomIndex(filename)
+
+    def getIndex(self):
+        return self.__index
+
+    def close(self):
+        self.__index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    @staticmethod
+    def collect(tree):
+        ids = [individual.getId() for individual in tree.getIndividuals()]
+        ids.extend(family.getId() for family in tree.getFamilies())
+
+        return ids
+
+    def write(self, ids, filename = None):
+        if filename is None:
+            filename = '%s.ged' % SubsetWriter.NAME
+
+        if os.path.exists(filename) and os.path.samefile(filename, self.__index.getFilename()):
+            raise Exception('Refusing to overwrite the source file %s' % filename)
+
+        included = set(id for id in ids if self.__index.contains(id))
+        head = self.__readHead(included)
+        runs, drops = self.__resolve(included)
+
+        summary = {
+            'filename': filename, 'records': len(included), 'trimmed': len(drops), 'bytes': 0,
+            'tags': self.__index.countTags(included)
+        }
+
+        with open(filename, 'wb', buffering = SubsetWriter.BUFFER_SIZE) as fp:
+            summary['bytes'] += fp.write(self.__formatHead(head, filename, len(included)))
+
+            newline = self.__index.getNewline()
+            last = newline
+            with memoryview(self.__index.getData()) as data:
+                drop = 0
+                for start, end in runs:
+                    while drop < len(drops) and drops[drop][0] < end:
+                        summary['bytes'] += fp.write(data[start:drops[drop][0]])
+                        start = drops[drop][1]
+                        drop += 1
+                    summary['bytes'] += fp.write(data[start:end])
+                    if end > start:
+                        last = bytes(data[end - 1:end])
+
+            if not newline.endswith(last):
+                summary['bytes'] += fp.write(newline)
+            summary['bytes'] += fp.write(b'0 TRLR' + newline)
+
+        return summary
+
+    def __readHead(self, included):
+        blocks = {}
+        tag = None
+        for line in self.__index.getHead().splitlines()[1:]:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+
+            if parts[0] == b'1':
+                tag = parts[1]
+                if tag not in SubsetWriter.HEAD_TAGS:
+                    continue
+
+                blocks[tag] = []
+                if tag == b'SUBM' and len(parts) > 2:
+                    target = parts[2].replace(b'@', b'').decode('ascii', 'replace')
+                    if not self.__index.contains(target):
+                        del blocks[tag]
+                        continue
+                    included.add(target)
+
+            if tag in blocks:
+                blocks[tag].append(line)
+
+        for tag, lines in SubsetWriter.DEFAULT_HEAD.items():
+            blocks.setdefault(tag, lines)
+
+        return blocks
+
+    def __formatHead(self, blocks, filename, count):
+        today = time.localtime()
+        lines = [
+            b'0 HEAD',
+            b'1 SOUR GEDCOM_FORMATTER',
+            b'2 NAME gedcom_formatter',
+            ('1 DATE %d %s %d' % (today.tm_mday, SubsetWriter.MONTHS[today.tm_mon - 1], today.tm_year)).encode('ascii'),
+            b'1 FILE ' + os.path.basename(filename).encode('utf-8')
+        ]
+        for tag in SubsetWriter.HEAD_TAGS:
+            lines.extend(blocks.get(tag, []))
+        lines.append(('1 NOTE Subset of %s with %d records' % (
+            os.path.basename(self.__index.getFilename()), count
+        )).encode('utf-8'))
+
+        newline = self.__index.getNewline()
+
+        return newline.join(lines) + newline
+
+    def __resolve(self, included):
+        data = self.__index.getData()
+        keys = set(id.encode('ascii') for id in included)
+        runs = []
+        drops = []
+
+        pending = list(included)
+        while len(pending) > 0:
+            added = []
+            for start, end in self.__getRuns(pending):
+                runs.append((start, end))
+                drops.extend(self.__scan(data, start, end, included, keys, added))
+            pending = added
+
+        return self.__merge(runs), sorted(drops)
+
+    def __getRuns(self, ids):
+        runs = []
+        for start, end in sorted(self.__index.getRanges(ids)):
+            if len(runs) > 0 and runs[-1][1] == start:
+                runs[-1][1] = end
+            else:
+                runs.append([start, end])
+
+        return runs
+
+    def __merge(self, runs):
+        merged = []
+        for start, end in sorted(runs):
+            if len(merged) > 0 and merged[-1][1] == start:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+
+        return merged
+
+    def __scan(self, data, start, end, included, keys, added):
+        drops = []
+        if len(set(SubsetWriter.__pointerRegex.findall(data, start, end)) - keys) == 0:
+            return drops
+
+        for match in SubsetWriter.__pointerRegex.finditer(data, start, end):
+            key = match.group(1)
+            if key in keys:
+                continue
+
+            lineStart = data.rfind(b'\n', start, match.start()) + 1
+            parts = data[lineStart:match.start()].split()
+            if len(parts) not in (2, 3) or not parts[0].isdigit() or (len(parts) == 3 and parts[1][:1] != b'@'):
+                continue
+
+            id = key.decode('ascii', 'replace')
+            if not self.__index.contains(id) or (len(drops) > 0 and lineStart < drops[-1][1]):
+                continue
+
+            if self.__index.getTag(id) in SubsetWriter.TREE_TAGS:
+                drops.append((lineStart, self.__blockEnd(data, lineStart, end, int(parts[0]))))
+            else:
+                included.add(id)
+                keys.add(key)
+                added.append(id)
+
+        return drops
+
+    def __blockEnd(self, data, start, end, level):
+        for match in SubsetWriter.__lineRegex.finditer(data, start, end):
+            if int(match.group(1)) <= level:
+                return match.start() + 1
+
+        return end
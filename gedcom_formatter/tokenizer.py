@@ -0,0 +1,94 @@
+import codecs
+import re as regex
+
+class GedcomParseError(Exception):
+    def __init__(self, lineNumber, message):
+        Exception.__init__(self, 'Line %d: %s' % (lineNumber, message))
+        self.lineNumber = lineNumber
+        self.reason = message
+
+    def __reduce__(self):
+        return (GedcomParseError, (self.lineNumber, self.reason))
+
+    def withLineOffset(self, offset):
+        return GedcomParseError(self.lineNumber + offset, self.reason)
+
+class GedcomTokenizer():
+    LINE_REGEX = '^(0|[1-9]+[0-9]*) (@[A-Z0-9]+@ |)([A-Za-z0-9_]+)(.*|)$'
+
+    CHUNK_SIZE = 1 << 20
+
+    __lineRegex = regex.compile(LINE_REGEX)
+
+    def __init__(self, fp, firstLineNumber = 1, size = None):
+        self.__fp = fp
+        self.__firstLineNumber = firstLineNumber
+        self.__size = size
+        self.__lineCount = 0
+
+    def getLineCount(self):
+        return self.__lineCount
+
+    def __iter__(self):
+        lineNumber = self.__firstLineNumber
+
+        for lines in self.__iterLineBlocks():
+            for line in lines:
+                level, sep, rest = line.partition(' ')
+
+                if sep and level.isdigit() and level.isascii() and (level[0] != '0' or level == '0'):
+                    pointer = ''
+                    if rest[:1] == '@':
+                        pointer, sep, rest = rest.partition(' ')
+                        name = pointer[1:-1]
+                        if sep and pointer[-1] == '@' and name.isalnum() and name.isascii() and name.upper() == name:
+                            pointer += ' '
+                        else:
+                            sep = ''
+
+                    tag, _, value = rest.partition(' ')
+                    if sep and tag.isascii() and (tag.isalnum() or tag.replace('_', '').isalnum()):
+                        yield lineNumber, int(level), pointer, tag, value
+                        lineNumber += 1
+                        continue
+
+                yield self.__tokenizeFallback(lineNumber, line)
+                lineNumber += 1
+
+        self.__lineCount = lineNumber - self.__firstLineNumber
+
+    def __iterLineBlocks(self):
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        remaining = self.__size
+        rest = ''
+
+        while True:
+            chunkSize = GedcomTokenizer.CHUNK_SIZE
+            if remaining is not None:
+                chunkSize = min(chunkSize, remaining)
+
+            chunk = self.__fp.read(chunkSize) if chunkSize > 0 else b''
+            if remaining is not None:
+                remaining -= len(chunk)
+
+            text = rest + decoder.decode(chunk, final = not chunk)
+            lines = text.replace('\r\n', '\n').split('\n')
+            rest = lines.pop()
+
+            if len(lines) > 0:
+                yield lines
+
+            if not chunk:
+                break
+
+        if rest:
+            yield [rest]
+
+    def __tokenizeFallback(self, lineNumber, line):
+        matches = GedcomTokenizer.__lineRegex.match(line)
+        if matches is None:
+            raise GedcomParseError(lineNumber, '%s parse error' % line)
+
+        level, pointer, tag, value = matches.groups()
+
+        return lineNumber, int(level), pointer, tag, value
@@ -1,6 +1,8 @@
 from .gedcom import GedcomIndividual, GedcomFamily
 
 class Node(object):
+    __slots__ = ('_id', '_level', '__parent', '_childs', '__prevSibling', '__nextSibling')
+
     def __init__(self, id, level):
         self._id = id
         self._level = level
@@ -21,11 +23,6 @@ class Node(object):
 
     def addChild(self, child):
         child.setParent(self)
-        if self.hasChilds():
-            last = self._childs[-1]
-            last.setNextSibling(child)
-            child.setPrevSibling(last)
-
         self._childs.append(child)
 
     def getChilds(self):
@@ -53,11 +50,15 @@ class Node(object):
         return self.__nextSibling
 
 class Generation():
+    __slots__ = (
+        '_id', '__level', '__members', '__first', '__last', '__prevGeneration', '__nextGeneration'
+    )
+
     def __init__(self, level):
         self._id = 'G%d' % level 
         self.__level = level
 
-        self.__count = 0
+        self.__members = {}
 
         self.__first = None
         self.__last = None
@@ -68,39 +69,72 @@ class Generation():
     def getId(self):
         return self._id
 
+    def getLevel(self):
+        return self.__level
+
     def isInitialized(self):
         return self.__first is not None
 
+    def contains(self, individual):
+        return self.__members.get(individual.getId()) is individual
+
     def append(self, individuals):
-        count = len(individuals)
-        if self.isInitialized():
-            firstIndividual = individuals[0]
-            while firstIndividual.getPrevSibling() is not None:
-                firstIndividual = firstIndividual.getPrevSibling()
-                count += 1
-
-            self.__last.setNextSibling(firstIndividual)
-            firstIndividual.setPrevSibling(self.__last)
-
-            lastIndividual = individuals[-1]
-            while lastIndividual.getNextSibling() is not None:
-                lastIndividual = lastIndividual.getNextSibling()
-                count +=1
-
-            self.__last = lastIndividual
+        for individual in individuals:
+            if not self.__isPlaceable(individual):
+                continue
+
+            if self.__last is None:
+                self.__first = individual
+            else:
+                self.__last.setNextSibling(individual)
+                individual.setPrevSibling(self.__last)
+
+            self.__last = individual
+            self.__members[individual.getId()] = individual
+
+    def insertAfter(self, anchor, individual):
+        next = anchor.getNextSibling()
+        anchor.setNextSibling(individual)
+        individual.setPrevSibling(anchor)
+        individual.setNextSibling(next)
+
+        if next is None:
+            self.__last = individual
         else:
-            self.__first = individuals[0]
-            self.__last = individuals[-1]
+            next.setPrevSibling(individual)
 
-        self.__count += count
+        self.__members[individual.getId()] = individual
 
-    def fixFirst(self):
-        while self.__first.getPrevSibling() is not None:
-            self.__first = self.__first.getPrevSibling()
-            self.__count += 1
+    def insertBefore(self, anchor, individual):
+        prev = anchor.getPrevSibling()
+        anchor.setPrevSibling(individual)
+        individual.setNextSibling(anchor)
+        individual.setPrevSibling(prev)
+
+        if prev is None:
+            self.__first = individual
+        else:
+            prev.setNextSibling(individual)
+
+        self.__members[individual.getId()] = individual
+
+    def placePartners(self, partners):
+        for position, partner in enumerate(partners):
+            if not self.__isPlaceable(partner):
+                continue
+
+            if position > 0 and self.contains(partners[position - 1]):
+                self.insertAfter(partners[position - 1], partner)
+            elif position + 1 < len(partners) and self.contains(partners[position + 1]):
+                self.insertBefore(partners[position + 1], partner)
+            else:
+                self.append([partner])
+
+    def __isPlaceable(self, individual):
+        return individual.getLevel() == self.__level and individual.getId() not in self.__members
 
     def getCount(self):
-        return self.__count
+        return len(self.__members)
 
     def getFirst(self):
         return self.__first
@@ -126,6 +160,8 @@ class Generation():
         return individuals
 
 class Individual(Node):
+    __slots__ = ('__gedcom', '__families')
+
     def __init__(self, gedcom: GedcomIndividual, level):
         Node.__init__(self, gedcom.getId(), level)
         self.__gedcom = gedcom
@@ -153,6 +189,8 @@ class Individual(Node):
         return self._id
 
 class Family(Node):
+    __slots__ = ('__info', '__partners')
+
     def __init__(self, gedcom: GedcomFamily, level):
         Node.__init__(self, gedcom.getId(), level)
         self.__info = gedcom
@@ -179,19 +217,6 @@ class Family(Node):
         if revert:
             self.__partners.reverse()
 
-        prevPartner1 = self.__partners[1].getPrevSibling()
-        if prevPartner1 is not None:
-            prevPartner1.setNextSibling(self.__partners[0])
-            self.__partners[0].setPrevSibling(prevPartner1)
-
-        nextPartner0 = self.__partners[0].getNextSibling()
-        if nextPartner0 is not None:
-            nextPartner0.setPrevSibling(self.__partners[1])
-            self.__partners[1].setNextSibling(nextPartner0)
-
-        self.__partners[0].setNextSibling(self.__partners[1])
-        self.__partners[1].setPrevSibling(self.__partners[0])
-
     def getPartners(self):
         return self.__partners
 
@@ -212,47 +237,171 @@ class FamilyTree():
         self.__rootFamily = None
         self.__generations = {}
         self.__individuals = {}
+        self.__families = {}
+        self.__links = []
+        self.__maxDepth = None
 
     def build(self, rootFamily, maxDepth = 1):
-        gFamily = self.__gedcom.getFamily(rootFamily) 
-        
+        self.__maxDepth = maxDepth
+        gFamily = self.__gedcom.getFamily(rootFamily)
+
         self.__rootFamily = self.__addFamily(gFamily, maxDepth, maxDepth)
 
+        pending = self.__expandFamily(self.__rootFamily, gFamily, maxDepth)
+        while len(pending) > 0:
+            child, familyId, depth = pending.pop()
+            if familyId in self.__families:
+                self.__links.append((child, self.__families[familyId]))
+                continue
+
+            gFamily = self.__gedcom.getFamily(familyId)
+            family = self.__addFamily(gFamily, maxDepth, depth)
+            pending.extend(self.__expandFamily(family, gFamily, depth))
+
+    def buildAncestors(self, rootIndividual, maxDepth = 1):
+        layers = [[rootIndividual]]
+        parentFamilies = []
+        seenIndividuals = {rootIndividual}
+        seenFamilies = set()
+
+        while len(layers) < maxDepth:
+            families = []
+            nextLayer = []
+            for childId in layers[-1]:
+                gFamily = self.__gedcom.getParentFamily(childId)
+                if gFamily is None:
+                    continue
+
+                families.append((childId, gFamily))
+                if gFamily.getId() in seenFamilies:
+                    continue
+                seenFamilies.add(gFamily.getId())
+
+                for partnerId in gFamily.getCouple():
+                    if partnerId not in seenIndividuals:
+                        seenIndividuals.add(partnerId)
+                        nextLayer.append(partnerId)
+
+            if len(families) == 0:
+                break
+
+            parentFamilies.append(families)
+            layers.append(nextLayer)
+
+        top = len(layers) - 1
+        for level in range(top + 1):
+            self.__getGeneration(level)
+
+        root = self.__getIndividual(rootIndividual, top)
+        self.__getGeneration(top).append([root])
+
+        for distance, families in enumerate(parentFamilies):
+            level = top - distance - 1
+            for layerId in layers[distance + 1]:
+                self.__getIndividual(layerId, level)
+
+            for childId, gFamily in families:
+                child = self.__individuals[childId]
+                if gFamily.getId() in self.__families:
+                    family = self.__families[gFamily.getId()]
+                    self.__links.append((child, family))
+                else:
+                    family = self.__addFamily(gFamily, top, top - level)
+
+                family.addChild(child)
+
+        self.__rootFamily = root.getParent()
+
+    def getMaxDepth(self):
+        return self.__maxDepth
+
+    def truncate(self, maxDepth):
+        if self.__maxDepth is None or maxDepth > self.__maxDepth or not self.__isTruncatable(maxDepth):
+            return None
+
+        tree = FamilyTree(self.__gedcom)
+        tree.__maxDepth = maxDepth
+
+        for id, individual in self.__individuals.items():
+            if individual.getLevel() < maxDepth:
+                tree.__individuals[id] = Individual(individual.getGedcom(), individual.getLevel())
+
+        for id, family in self.__families.items():
+            if family.getLevel() >= maxDepth:
+                continue
+
+            copy = Family(family.getInfo(), family.getLevel())
+            tree.__families[id] = copy
+            copy.addPartners([tree.__individuals[partnerId] for partnerId in family.getInfo().getCouple()])
+
+            if family.getLevel() < maxDepth - 1:
+                for child in family.getChilds():
+                    copy.addChild(tree.__individuals[child.getId()])
+
+        for level in range(maxDepth):
+            if level in self.__generations:
+                tree.__getGeneration(level).append(
+                    [tree.__individuals[individual.getId()] for individual in self.__generations[level].getIndividuals()]
+                )
+
+        tree.__links = [
+            (tree.__individuals[child.getId()], tree.__families[family.getId()])
+            for child, family in self.__links if child.getLevel() < maxDepth
+        ]
+        tree.__rootFamily = tree.__families[self.__rootFamily.getId()]
+
+        return tree
+
+    def __isTruncatable(self, maxDepth):
+        for family in self.__families.values():
+            expanded = family.getLevel() < maxDepth - 1
+            if family.getLevel() < maxDepth and any(
+                partner.getLevel() >= maxDepth for partner in family.getPartners()
+            ):
+                return False
+
+            for child in family.getChilds():
+                if (child.getLevel() < maxDepth) != expanded:
+                    return False
+
+        for child, family in self.__links:
+            if child.getLevel() < maxDepth and family.getLevel() >= maxDepth:
+                return False
+
+        return True
+
     def getRootGeneration(self):
         return self.__generations[0]
 
     def __addFamily(self, gFamily, maxDepth, depth):
-
         level = maxDepth - depth
 
         family = Family(gFamily, level)
+        self.__families[family.getId()] = family
 
         partners = list(map(lambda x: self.__getIndividual(x, level), gFamily.getCouple()))
         family.addPartners(partners)
 
-        generation = self.__getGeneration(level)
-        if not generation.isInitialized():
-            partners = family.getPartners()
-            generation.append(partners)
+        self.__getGeneration(level).placePartners(family.getPartners())
 
+        return family
+
+    def __expandFamily(self, family, gFamily, depth):
         if depth <= 1:
-            return family
+            return []
 
+        level = family.getLevel()
         childs = self.__addChildsToFamily(family, gFamily.getChildren(), level + 1)
-        
-        if len(childs) > 0:
-            childGeneration = self.__getGeneration(level + 1)
-            childGeneration.append(childs)
 
-            for child in childs:
-                families = child.getGedcom().getFamilies()
-                for familyId in families:
-                    familyChild = self.__gedcom.getFamily(familyId)
-                    self.__addFamily(familyChild, maxDepth, depth - 1)
+        if len(childs) > 0:
+            self.__getGeneration(level + 1).append(childs)
 
-            childGeneration.fixFirst()
+        tasks = []
+        for child in reversed(childs):
+            for familyId in reversed(child.getGedcom().getFamilies()):
+                tasks.append((child, familyId, depth - 1))
 
-        return family
+        return tasks
 
     def __getGeneration(self, level):
         if level not in self.__generations:
@@ -266,9 +415,21 @@ class FamilyTree():
     def getRootFamily(self):
         return self.__rootFamily
 
+    def getRootFamilies(self):
+        return [
+            family for family in self.__families.values()
+            if not any(partner.isChild() for partner in family.getPartners())
+        ]
+
     def getIndividuals(self):
         return self.__individuals.values()
 
+    def getFamilies(self):
+        return self.__families.values()
+
+    def getLinks(self):
+        return self.__links
+
     def __getIndividual(self, id, level):
         if id not in self.__individuals:
             gIndividual = self.__gedcom.getIndividual(id)
@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+
+from .tree import FamilyTree
+
+class LRUCache():
+    def __init__(self, maxSize):
+        self.__maxSize = maxSize
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key):
+        if key not in self.__entries:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+
+        return self.__entries[key]
+
+    def peek(self, key):
+        return self.__entries.get(key)
+
+    def put(self, key, value):
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__maxSize:
+            self.__entries.popitem(last = False)
+
+    def keys(self):
+        return list(self.__entries.keys())
+
+    def clear(self):
+        self.__entries.clear()
+
+    def getStatistics(self):
+        return {'size': len(self.__entries), 'maxSize': self.__maxSize, 'hits': self.__hits, 'misses': self.__misses}
+
+    def __len__(self):
+        return len(self.__entries)
+
+class TreeCache():
+    def __init__(self, gedcom, maxTrees = 16):
+        self.__gedcom = gedcom
+        self.__trees = LRUCache(maxTrees)
+        self.__lock = threading.Lock()
+        self.__counts = {'hits': 0, 'truncated': 0, 'built': 0, 'fallbacks': 0}
+
+    def get(self, root, depth, ancestors = False):
+        key = (root, depth, ancestors)
+        with self.__lock:
+            tree = self.__trees.get(key)
+            if tree is not None:
+                self.__counts['hits'] += 1
+                return tree
+
+            deeper = self.__findDeeper(root, depth, ancestors)
+
+        tree = None
+        counters = []
+        if deeper is not None:
+            tree = deeper.truncate(depth)
+            counters.append('truncated' if tree is not None else 'fallbacks')
+
+        if tree is None:
+            tree = FamilyTree(self.__gedcom)
+            if ancestors:
+                tree.buildAncestors(root, depth)
+            else:
+                tree.build(root, depth)
+            counters.append('built')
+
+        with self.__lock:
+            for counter in counters:
+                self.__counts[counter] += 1
+            self.__trees.put(key, tree)
+
+        return tree
+
+    def __findDeeper(self, root, depth, ancestors):
+        if ancestors:
+            return None
+
+        deeperDepth = None
+        for cachedRoot, cachedDepth, cachedAncestors in self.__trees.keys():
+            if cachedRoot != root or cachedAncestors:
+                continue
+
+            if cachedDepth > depth and (deeperDepth is None or cachedDepth < deeperDepth):
+                deeperDepth = cachedDepth
+
+        if deeperDepth is None:
+            return None
+
+        return self.__trees.peek((root, deeperDepth, False))
+
+    def getStatistics(self):
+        statistics = dict(self.__counts)
+        statistics['size'] = len(self.__trees)
+
+        return statistics
+
+    def __len__(self):
+        return len(self.__trees)